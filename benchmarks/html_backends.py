@@ -0,0 +1,113 @@
+"""
+Benchmark of the HTML parser backends on the saved element pages.
+
+Every page is loaded into BeautifulSoup and matched against its extraction spec,
+like the extractors do, with every installed tree builder,
+with the whole tree and with the sections only strainer.
+The parse time is the median of the runs, the peak memory is measured by tracemalloc,
+so it counts the python objects of the tree and not the internal buffers of lxml.
+
+The pages in tests/fixtures/pages are synthetic, they are written after the extractor
+selectors, so the numbers are only indicative until they are replaced with the saved pages.
+
+Run from the repository root:
+    python -m benchmarks.html_backends --repeat 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The settings need the database url, the benchmark doesn't use the database.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from bs4 import BeautifulSoup  # noqa: E402
+from bs4.builder import builder_registry  # noqa: E402
+
+from src.parsers.html_backend import make_section_strainer  # noqa: E402
+from src.parsers.kanji import KanjiExtractor  # noqa: E402
+from src.parsers.wk_radical import WKRadicalExtractor  # noqa: E402
+from src.parsers.word import WordExtractor  # noqa: E402
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES_DIR = os.path.join(PROJECT_DIR, "tests", "fixtures", "pages")
+
+PAGES = {
+    "radical": WKRadicalExtractor,
+    "kanji": KanjiExtractor,
+    "vocabulary": WordExtractor,
+}
+
+BACKENDS = ("lxml", "html.parser")
+
+
+def extract_fields(extractor_class: type, page_html: str, backend: str, parse_only):
+    """Loading the page and matching the spec like BaseExtractor._extract_fields."""
+    soup = BeautifulSoup(page_html, features=backend, parse_only=parse_only)
+    return extractor_class.spec.extract(soup)
+
+
+def measure(
+    extractor_class: type, page_html: str, backend: str, parse_only, repeat: int
+) -> tuple[float, float]:
+    """
+    Measuring the parse time and the peak memory of one page.
+
+    Returns:
+        tuple[float, float] - the median time in milliseconds and the peak memory in KiB
+    """
+    times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract_fields(extractor_class, page_html, backend, parse_only)
+        times.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    extract_fields(extractor_class, page_html, backend, parse_only)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(times), peak / 1024
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    argument_parser.add_argument("--repeat", type=int, default=20)
+    args = argument_parser.parse_args()
+
+    backends = [backend for backend in BACKENDS if builder_registry.lookup(backend)]
+
+    print(
+        f"{'page':<12}{'size':>8}  {'backend':<12}{'tree':<10}"
+        f"{'ms':>8}{'peak KiB':>10}"
+    )
+
+    for page_name, extractor_class in PAGES.items():
+        page_path = os.path.join(PAGES_DIR, f"{page_name}.html")
+        with open(page_path, encoding="utf-8") as file:
+            page_html = file.read()
+
+        modes = {
+            "whole": None,
+            "sections": make_section_strainer(extractor_class.parsed_sections),
+        }
+
+        for backend in backends:
+            for mode, parse_only in modes.items():
+                median_ms, peak_kib = measure(
+                    extractor_class, page_html, backend, parse_only, args.repeat
+                )
+                print(
+                    f"{page_name:<12}{len(page_html) // 1024:>6}KB  "
+                    f"{backend:<12}{mode:<10}{median_ms:>8.2f}{peak_kib:>10.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
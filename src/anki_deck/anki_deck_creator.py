@@ -1,47 +1,309 @@
+"""
+Building the Anki decks of the radicals, kanji and vocabulary from the database.
+
+The model and deck ids are derived from the deck type
+and the note GUIDs from the element urls, so a package imported again updates the notes of the same deck.
+The content hashes of the exported notes are kept in the manifest of every deck,
+and the next export packs only the new and the changed notes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
 import genanki
 
-from src.models.wk_radical import WaniKaniRadical
-from src.parsers.wk_radical import wanikani_radicals_parser, import_from_csv
-from random import randint
+from src.anki_deck.export_to_csv import (
+    iter_kanji_csv_rows_with_urls,
+    iter_words_csv_rows_with_urls,
+)
+from src.crud import CrudWKRadical
+from src.database import SessionLocal, engine
+from src.models import WKRadical
 
+AUDIO_DIR = "output/audio"
+IMAGES_DIR = "output/images"
+DECKS_DIR = "output"
 
-# Flag for reading all radical data from csv file.
-READ_FROM_CSV_FILE = True
+crud_wk_radical = CrudWKRadical(WKRadical)
 
 
-model_id = randint(1, 2 ** 32 - 1)
-deck_id = randint(1, 2 ** 32 - 1)
+class DeckType:
+    WK_RADICALS = "wk_radicals"
+    KANJI = "kanji"
+    WORDS = "words"
 
-wanikani_radicals_anki_model = genanki.Model(
-    model_id=model_id,
-    fields=[
-        {"name": "Radical"},
-        {"name": "Meaning"},
-        {"name": "Mnemonic"}
-    ],
-    templates=[{
-        "qfmt": "<h1>{{Radical}}</h1>",
-        "afmt": "Meaning: <strong>{{Meaning}}</strong><br>Story: {{Mnemonic}}"
-    }]
-)
-wanikani_radicals_anki_deck = genanki.Deck(
-    deck_id=deck_id,
-    name="WaniKani Radicals"
-)
 
-wanikani_radicals = []
+def get_media_file(directory: str, file_name: str | None) -> str | None:
+    """
+    Getting the path of the downloaded media file.
+    Only the path is kept, the file is read when the package is written.
+
+    Returns:
+        str | None: The path of the file, None if the file isn't downloaded.
+    """
+    if not file_name:
+        return None
+
+    file_path = os.path.join(directory, file_name)
+    return file_path if os.path.isfile(file_path) else None
+
+
+def get_note_fields(row: list) -> list[str]:
+    """Getting the note fields from the csv row, all the fields must be strings."""
+    return ["" if value is None else str(value) for value in row]
+
+
+def get_stable_id(name: str) -> int:
+    """
+    Getting the model or deck id, which is the same on every export.
+    The ids are in the range, which genanki recommends: [2^30, 2^31).
+    """
+    digest = hashlib.sha256(name.encode()).digest()
+    return (1 << 30) + int.from_bytes(digest[:4], "big") % (1 << 30)
+
+
+def get_note_hash(fields: list[str], media_files: list[str]) -> str:
+    """Getting the content hash of the note fields and its media file names."""
+    content = json.dumps(
+        [fields, [os.path.basename(media_file) for media_file in media_files]],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def load_manifest(manifest_path: str) -> dict[str, str]:
+    """
+    Loading the content hashes of the notes by their GUIDs from the last export.
+    The manifest is empty if the deck wasn't exported yet.
+    """
+    if not os.path.isfile(manifest_path):
+        return {}
+
+    with open(manifest_path) as file:
+        return json.load(file)
+
+
+def save_manifest(manifest_path: str, note_hashes: dict[str, str]) -> None:
+    """Saving the manifest, the file is replaced only after it's fully written."""
+    temp_path = f"{manifest_path}.tmp"
+
+    with open(temp_path, "w") as file:
+        json.dump(note_hashes, file, sort_keys=True)
+
+    os.replace(temp_path, manifest_path)
+
+
+def iter_radical_notes(before_level: int) -> Iterator[tuple[str, list, list[str]]]:
+    """
+    Getting the urls and the fields of the radicals with the paths of their images.
+    The radicals without plain symbol are shown by their images.
+    """
+    with SessionLocal() as db:
+        radicals = crud_wk_radical.get_by_level(db, before_level)
+
+    for radical in radicals:
+        symbol = radical.symbol or ""
+        media_files = []
+
+        if radical.is_symbol_image:
+            image_file = get_media_file(
+                IMAGES_DIR, radical.image_filename or f"{radical.meaning}.svg"
+            )
+            if image_file:
+                media_files.append(image_file)
+                symbol = f'<img src="{os.path.basename(image_file)}">'
+
+        yield radical.url, [symbol, radical.meaning, radical.mnemonic], media_files
 
-if READ_FROM_CSV_FILE:
-    wanikani_radicals: list[WaniKaniRadical] = import_from_csv()
 
-else:
-    wanikani_radicals: list[WaniKaniRadical] = wanikani_radicals_parser()
+def iter_kanji_notes(before_level: int) -> Iterator[tuple[str, list, list[str]]]:
+    """Getting the urls and the fields of the kanji, they don't have media files."""
+    for url, row in iter_kanji_csv_rows_with_urls(before_level):
+        yield url, row, []
 
-for wanikani_radical in wanikani_radicals:
-    wanikani_radical_note = genanki.Note(
-        model=wanikani_radicals_anki_model,
-        fields=[wanikani_radical.symbol, wanikani_radical.meaning, wanikani_radical.mnemonic]
+
+def iter_word_notes(before_level: int) -> Iterator[tuple[str, list, list[str]]]:
+    """Getting the urls and the fields of the words with the paths of their audio."""
+    for url, row in iter_words_csv_rows_with_urls(before_level):
+        # The fourth column is the reading audio file name.
+        audio_file = get_media_file(AUDIO_DIR, row[3])
+
+        if audio_file:
+            row[3] = f"[sound:{os.path.basename(audio_file)}]"
+            yield url, row, [audio_file]
+        else:
+            row[3] = ""
+            yield url, row, []
+
+
+# The name, the note fields, the card template and the notes iterator of every deck.
+DECKS = {
+    DeckType.WK_RADICALS: (
+        "WaniKani Radicals",
+        ["Radical", "Meaning", "Mnemonic"],
+        {
+            "qfmt": "<h1>{{Radical}}</h1>",
+            "afmt": "Meaning: <strong>{{Meaning}}</strong><br>Story: {{Mnemonic}}",
+        },
+        iter_radical_notes,
+    ),
+    DeckType.KANJI: (
+        "WaniKani Kanji",
+        [
+            "Level",
+            "Kanji",
+            "Radicals",
+            "Meaning",
+            "Readings",
+            "Reading Mnemonic",
+            "Reading Hint",
+            "Meaning Mnemonic",
+            "Meaning Hint",
+        ],
+        {
+            "qfmt": "<h1>{{Kanji}}</h1>",
+            "afmt": (
+                "{{FrontSide}}<hr>Radicals: {{Radicals}}<br>"
+                "Meaning: <strong>{{Meaning}}</strong><br>{{Meaning Mnemonic}}<br>"
+                "Readings: <strong>{{Readings}}</strong><br>{{Reading Mnemonic}}"
+            ),
+        },
+        iter_kanji_notes,
+    ),
+    DeckType.WORDS: (
+        "WaniKani Vocabulary",
+        [
+            "Level",
+            "Word",
+            "Reading",
+            "Audio",
+            "Reading Explanation",
+            "Meanings",
+            "Meaning Explanation",
+            "Context Sentences",
+            "Use Patterns",
+            "Types",
+        ],
+        {
+            "qfmt": "<h1>{{Word}}</h1>",
+            "afmt": (
+                "{{FrontSide}}<hr>Meanings: <strong>{{Meanings}}</strong><br>"
+                "Reading: <strong>{{Reading}}</strong> {{Audio}}<br>"
+                "{{Meaning Explanation}}<br>{{Reading Explanation}}<br>"
+                "{{Context Sentences}}"
+            ),
+        },
+        iter_word_notes,
+    ),
+}
+
+
+def build_deck(deck_type: str, before_level: int, full: bool = False) -> str | None:
+    """
+    Building the deck package of the elements,
+    which have lower or equal level than before_level.
+    Only the notes changed since the last export are packed, unless full is set.
+    The function is called in the deck worker process.
+
+    Returns:
+        str | None: The path of the written package, None if no note is changed.
+    """
+    deck_name, fields, template, iter_notes = DECKS[deck_type]
+
+    model = genanki.Model(
+        model_id=get_stable_id(f"{deck_type}:model"),
+        name=deck_name,
+        fields=[{"name": field} for field in fields],
+        templates=[{"name": "Card", **template}],
     )
-    wanikani_radicals_anki_deck.add_note(wanikani_radical_note)
+    deck = genanki.Deck(deck_id=get_stable_id(f"{deck_type}:deck"), name=deck_name)
+
+    manifest_path = os.path.join(DECKS_DIR, f"{deck_type}.manifest.json")
+    exported_hashes = {} if full else load_manifest(manifest_path)
+    note_hashes = {}
+    media_files = []
+
+    for url, row, note_media_files in iter_notes(before_level):
+        note_fields = get_note_fields(row)
+        guid = genanki.guid_for(url)
+        note_hashes[guid] = get_note_hash(note_fields, note_media_files)
+
+        if exported_hashes.get(guid) == note_hashes[guid]:
+            continue
+
+        deck.add_note(genanki.Note(model=model, fields=note_fields, guid=guid))
+        media_files.extend(note_media_files)
+
+    if not deck.notes:
+        logging.info(f"{deck_name}: no changed notes.")
+        save_manifest(manifest_path, note_hashes)
+        return None
+
+    # The media files are passed by their paths,
+    # and every file is copied into the package while it's written.
+    # The notes share the media files (e.g. the same audio of the word readings),
+    # so the duplicates are removed to pack every file once.
+    media_files = list(dict.fromkeys(media_files))
+    file_path = os.path.join(DECKS_DIR, f"{deck_type}.apkg")
+    genanki.Package(deck, media_files=media_files).write_to_file(file_path)
+
+    # The manifest is saved after the package, so a failed export is repeated.
+    save_manifest(manifest_path, note_hashes)
+
+    logging.info(
+        f"{deck_name}: {len(deck.notes)} of {len(note_hashes)} notes, "
+        f"{len(media_files)} media files."
+    )
+    return file_path
+
+
+def _init_deck_worker() -> None:
+    """
+    Dropping the connections inherited from the parent process,
+    so every worker process opens its own connections.
+    """
+    engine.dispose(close=False)
+
+
+def build_decks(
+    deck_types: list[str], before_level: int, full: bool = False
+) -> list[str | None]:
+    """
+    Building the decks in parallel, one worker process per deck.
+
+    Returns:
+        list[str | None]: The paths of the written packages,
+        None for the decks without changed notes.
+    """
+    deck_count = len(deck_types)
+
+    with ProcessPoolExecutor(
+        max_workers=deck_count, initializer=_init_deck_worker
+    ) as executor:
+        return list(
+            executor.map(
+                build_deck,
+                deck_types,
+                [before_level] * deck_count,
+                [full] * deck_count,
+            )
+        )
+
+
+# The worker processes import this module too, so the decks are built only in the main process.
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    before_level = 10
+    deck_types = [DeckType.WK_RADICALS, DeckType.KANJI, DeckType.WORDS]
+
+    # The full export packs all the notes, for example, for a new Anki profile.
+    full = False
 
-genanki.Package(wanikani_radicals_anki_deck).write_to_file("output/wanikani_radicals.apkg")
\ No newline at end of file
+    for deck_file_path in build_decks(deck_types, before_level, full):
+        if deck_file_path:
+            print(deck_file_path)
@@ -1,41 +1,23 @@
 import csv
 import sys
+from typing import Iterable, Iterator
 
 sys.path.append("/home/jakefish/Documents/GitHub/wanikani-parser")
 
-from src.crud import (
-    CrudKanji,
-    CrudKanjiMeaning,
-    CrudKanjiReading,
-    CrudWord,
-    CrudWordContextSentence,
-    CrudWordMeaning,
-    CrudWordUsePattern,
-)
+from src.core import settings
+from src.crud import CrudKanji, CrudWord
 from src.database import SessionLocal
-from src.models import (
-    Kanji,
-    KanjiMeaning,
-    KanjiReading,
-    Word,
-    WordContextSentence,
-    WordMeaning,
-    WordUsePattern,
-)
+from src.models import Kanji, Word
 
 crud_kanji = CrudKanji(Kanji)
-crud_kanji_reading = CrudKanjiReading(KanjiReading)
-crud_kanji_meaning = CrudKanjiMeaning(KanjiMeaning)
 crud_word = CrudWord(Word)
-crud_word_use_pattern = CrudWordUsePattern(WordUsePattern)
-crud_word_context_sentence = CrudWordContextSentence(WordContextSentence)
-crud_word_meaning = CrudWordMeaning(WordMeaning)
 
 
 def get_kanji_primary_readings(kanji: Kanji) -> [str, str, str]:
     """
     Getting the primary reading of a kanji.
     Function returns the joined with commas string of readings.
+    The readings must be loaded together with the kanji.
 
     Returns:
         str: The primary readings of a kanji splited with the comma.
@@ -46,23 +28,25 @@ def get_kanji_primary_readings(kanji: Kanji) -> [str, str, str]:
     mnemonic = ""
     mnemonic_note = ""
 
-    with SessionLocal() as db:
-        for primary_reading in crud_kanji_reading.get_primary_readings(db, kanji):
-            reading_type = ""
-
-            match primary_reading.type:
-                case "On’yomi":
-                    reading_type = "O"
-                case "Kun’yomi":
-                    reading_type = "K"
-                case "Nanori":
-                    reading_type = "N"
-                case _:
-                    raise ValueError(f"Unknown reading type {primary_reading.type}")
-
-            mnemonic = primary_reading.mnemonic
-            mnemonic_note = primary_reading.mnemonic_hint
-            primary_readings.append(f"{primary_reading.reading}({reading_type})")
+    for primary_reading in sorted(kanji.readings, key=lambda reading: reading.id):
+        if not primary_reading.is_primary:
+            continue
+
+        reading_type = ""
+
+        match primary_reading.type:
+            case "On’yomi":
+                reading_type = "O"
+            case "Kun’yomi":
+                reading_type = "K"
+            case "Nanori":
+                reading_type = "N"
+            case _:
+                raise ValueError(f"Unknown reading type {primary_reading.type}")
+
+        mnemonic = primary_reading.mnemonic
+        mnemonic_note = primary_reading.mnemonic_hint
+        primary_readings.append(f"{primary_reading.reading}({reading_type})")
 
     return ", ".join(primary_readings), mnemonic, mnemonic_note
 
@@ -70,6 +54,7 @@ def get_kanji_primary_readings(kanji: Kanji) -> [str, str, str]:
 def get_kanji_primary_meaning(kanji: Kanji) -> [str, str, str]:
     """
     Getting the primary meaning of a kanji.
+    The meanings must be loaded together with the kanji.
 
     Returns:
         str: The primary meaning of a kanji.
@@ -80,11 +65,12 @@ def get_kanji_primary_meaning(kanji: Kanji) -> [str, str, str]:
     mnemonic = ""
     mnemonic_note = ""
 
-    with SessionLocal() as db:
-        primary_meaning_model = crud_kanji_meaning.get_primary_meaning(db, kanji)
-        primary_meaning = primary_meaning_model.meaning
-        mnemonic = primary_meaning_model.mnemonic
-        mnemonic_note = primary_meaning_model.mnemonic_hint
+    for meaning in sorted(kanji.meanings, key=lambda meaning: meaning.id):
+        if meaning.is_primary:
+            primary_meaning = meaning.meaning
+            mnemonic = meaning.mnemonic
+            mnemonic_note = meaning.mnemonic_hint
+            break
 
     return primary_meaning, mnemonic, mnemonic_note
 
@@ -116,39 +102,61 @@ def get_kanji_by_level(before_level: int) -> list[Kanji]:
         return crud_kanji.get_by_level(db, before_level)
 
 
+def get_kanji_csv_row(kanji: Kanji) -> list[str]:
+    """Getting the csv row of a kanji loaded with its children."""
+    kanji_radicals = get_kanji_radicals(kanji)
+    kanji_primary_readings, kanji_reading_mnemonic, kanji_reading_mnemonic_note = (
+        get_kanji_primary_readings(kanji)
+    )
+    kanji_primary_meaning, kanji_meaning_mnemonic, kanji_meaning_mnemonic_note = (
+        get_kanji_primary_meaning(kanji)
+    )
+
+    return [
+        kanji.level,
+        kanji.symbol,
+        kanji_radicals,
+        kanji_primary_meaning,
+        kanji_primary_readings,
+        kanji_reading_mnemonic,
+        kanji_reading_mnemonic_note,
+        kanji_meaning_mnemonic,
+        kanji_meaning_mnemonic_note,
+    ]
+
+
+def iter_kanji_csv_rows(before_level: int) -> Iterator[list[str]]:
+    """
+    Streaming the csv rows of the kanji,
+    which have lower or equal level than before_level.
+    The kanji are fetched by batches with their children,
+    so only one batch is kept in memory.
+    The children are loaded by 3 queries for every batch of EXPORT_BATCH_SIZE kanji.
+    """
+    for _, row in iter_kanji_csv_rows_with_urls(before_level):
+        yield row
+
+
+def iter_kanji_csv_rows_with_urls(before_level: int) -> Iterator[tuple[str, list[str]]]:
+    """Streaming the csv rows of the kanji like iter_kanji_csv_rows with their urls."""
+    with SessionLocal() as db:
+        for kanji in crud_kanji.iter_by_level_with_children(
+            db, before_level, settings.export_batch_size
+        ):
+            yield kanji.url, get_kanji_csv_row(kanji)
+
+
 def get_kanji_csv_rows(before_level: int) -> list[list[str]]:
     """
     Getting kanji from the database,
     which have lower or equal level than before_level.
+    The kanji are loaded with all their children by a fixed number of the queries,
+    unlike iter_kanji_csv_rows, which loads the children for every batch.
     """
-    db = SessionLocal()
-    kanji_models = crud_kanji.get_by_level(db, before_level)
-    kanji_rows = []
-
-    for kanji in kanji_models:
-        kanji_radicals = get_kanji_radicals(kanji)
-        kanji_primary_readings, kanji_reading_mnemonic, kanji_reading_mnemonic_note = (
-            get_kanji_primary_readings(kanji)
-        )
-        kanji_primary_meaning, kanji_meaning_mnemonic, kanji_meaning_mnemonic_note = (
-            get_kanji_primary_meaning(kanji)
-        )
-        kanji_rows.append(
-            [
-                kanji.level,
-                kanji.symbol,
-                kanji_radicals,
-                kanji_primary_meaning,
-                kanji_primary_readings,
-                kanji_reading_mnemonic,
-                kanji_reading_mnemonic_note,
-                kanji_meaning_mnemonic,
-                kanji_meaning_mnemonic_note,
-            ]
-        )
+    with SessionLocal() as db:
+        kanji_models = crud_kanji.get_by_level_with_children(db, before_level)
 
-    db.close()
-    return kanji_rows
+    return [get_kanji_csv_row(kanji) for kanji in kanji_models]
 
 
 def get_word_meanings(word: Word) -> str:
@@ -193,56 +201,97 @@ def get_word_use_patterns(word: Word) -> str:
     return "\n\n".join(word_use_patterns)
 
 
+def get_word_csv_row(word: Word) -> list[str]:
+    """Get the csv row of a word loaded with its children."""
+    return [
+        word.level,
+        word.symbols,
+        word.reading,
+        word.reading_audio_filename,
+        word.reading_explanation,
+        get_word_meanings(word),
+        get_word_meaning_explanation(word),
+        get_word_context_sentences(word),
+        get_word_use_patterns(word),
+        word.types,
+    ]
+
+
+def iter_words_csv_rows(before_level: int) -> Iterator[list[str]]:
+    """
+    Stream the csv rows of the words,
+    which have lower or equal level than before_level.
+    The words are fetched by batches with their children,
+    so only one batch is kept in memory.
+    The children are loaded by 3 queries for every batch of EXPORT_BATCH_SIZE words.
+    """
+    for _, row in iter_words_csv_rows_with_urls(before_level):
+        yield row
+
+
+def iter_words_csv_rows_with_urls(before_level: int) -> Iterator[tuple[str, list[str]]]:
+    """Stream the csv rows of the words like iter_words_csv_rows with their urls."""
+    with SessionLocal() as db:
+        for word in crud_word.iter_words_before_level_with_children(
+            db, before_level, settings.export_batch_size
+        ):
+            yield word.url, get_word_csv_row(word)
+
+
 def get_words_csv_rows(before_level: int) -> list[list[str]]:
     """
     Getting words from the database,
     which have lower or equal level than before_level.
+    The words are loaded with all their children by a fixed number of the queries,
+    unlike iter_words_csv_rows, which loads the children for every batch.
     """
-    db = SessionLocal()
-    word_models: list[Word] = crud_word.get_words_before_level(db, before_level)
-    word_rows = []
-
-    for word in word_models:
-        word_meanings = get_word_meanings(word)
-        word_meaning_explanation = get_word_meaning_explanation(word)
-        word_context_sentences = get_word_context_sentences(word)
-        word_use_patterns = get_word_use_patterns(word)
-        word_rows.append(
-            [
-                word.level,
-                word.symbols,
-                word.reading,
-                word.reading_audio_filename,
-                word.reading_explanation,
-                word_meanings,
-                word_meaning_explanation,
-                word_context_sentences,
-                word_use_patterns,
-                word.types,
-            ]
-        )
+    with SessionLocal() as db:
+        word_models = crud_word.get_words_before_level_with_children(db, before_level)
+
+    return [get_word_csv_row(word) for word in word_models]
+
+
+def write_csv_rows(file_path: str, rows: Iterable[list[str]]) -> int:
+    """
+    Writing the rows into the csv file as they come.
+    The file is flushed after every batch of the rows,
+    so the first rows are on the disk before the export is done.
+
+    Returns:
+        int: The number of the written rows.
+    """
+    rows_count = 0
+
+    with open(file_path, "w", newline="\n") as file:
+        writer = csv.writer(file, delimiter=",")
+
+        for row in rows:
+            writer.writerow(row)
+            rows_count += 1
+
+            if rows_count % settings.export_batch_size == 0:
+                file.flush()
+
+    return rows_count
+
+
+# The rows can be built from other modules, so the export runs only as a script.
+if __name__ == "__main__":
+    before_level = 10
+    deck_element = "words"
+    elements = iter([])
+
+    match deck_element:
+        case "kanji":
+            elements = iter_kanji_csv_rows(before_level=before_level)
+        case "wk_radicals":
+            pass
+        case "words":
+            elements = iter_words_csv_rows(before_level=before_level)
+        case _:
+            raise ValueError(f"Unknown deck element: {deck_element}")
 
-    return word_rows
-
-
-before_level = 10
-deck_element = "words"
-elements = []
-
-match deck_element:
-    case "kanji":
-        elements = get_kanji_csv_rows(before_level=before_level)
-    case "wk_radicals":
-        pass
-    case "words":
-        elements = get_words_csv_rows(before_level=before_level)
-    case _:
-        raise ValueError(f"Unknown deck element: {deck_element}")
-
-with open(
-    "/home/jakefish/Documents/GitHub/wanikani-parser/src/output/deck.csv",
-    "w",
-    newline="\n",
-) as file:
-    writer = csv.writer(file, delimiter=",")
-    writer.writerows(elements)
+    write_csv_rows(
+        "/home/jakefish/Documents/GitHub/wanikani-parser/src/output/deck.csv",
+        elements,
+    )
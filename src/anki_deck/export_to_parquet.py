@@ -0,0 +1,192 @@
+"""
+Exporting the tables into the columnar files for the analytics.
+
+Every table is streamed from the database by batches of EXPORT_BATCH_SIZE rows,
+and every batch is written as one record batch, so only one batch is kept in memory.
+The Parquet files are compressed and dictionary-encoded.
+The Arrow IPC files are not compressed, so the readers can memory-map them
+without copying, and only the low cardinality string columns are dictionary-encoded.
+"""
+
+import logging
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Boolean, DateTime, Integer, Table, select
+
+from src.core import settings
+from src.database import Base, SessionLocal
+
+# Importing the models registers their tables in the metadata.
+import src.models  # noqa: F401
+
+EXPORTED_TABLES = [
+    "wk_radicals",
+    "kanji",
+    "kanji_meanings",
+    "kanji_readings",
+    "kanji_radicals",
+    "words",
+    "word_meanings",
+    "word_context_sentences",
+    "word_use_patterns",
+]
+
+# The string columns with a few distinct values, which are dictionary-encoded in Arrow.
+DICTIONARY_COLUMNS = {
+    "kanji_readings": {"type"},
+    "words": {"types"},
+    "word_use_patterns": {"pattern"},
+}
+
+
+class ExportFormat:
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+def get_arrow_type(column_type) -> pa.DataType:
+    """Getting the arrow type of the column, the other types are exported as strings."""
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+
+    if isinstance(column_type, Integer):
+        return pa.int64()
+
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+
+    return pa.string()
+
+
+def get_table_schema(
+    table: Table, dictionary_columns: set[str] = frozenset()
+) -> pa.Schema:
+    """
+    Getting the arrow schema of the table.
+
+    Parameters:
+        table: Table - the exported table
+        dictionary_columns: set[str] - the names of the dictionary-encoded columns
+    """
+    return pa.schema(
+        [
+            pa.field(
+                column.name,
+                pa.dictionary(pa.int32(), pa.string())
+                if column.name in dictionary_columns
+                else get_arrow_type(column.type),
+                nullable=True,
+            )
+            for column in table.columns
+        ]
+    )
+
+
+class DictionaryEncoder:
+    """
+    Dictionary encoder of one column, which keeps the dictionary between the batches.
+    The dictionary of every batch starts with the dictionary of the previous batch,
+    so the IPC writer writes only the new values as the dictionary delta.
+    """
+
+    def __init__(self) -> None:
+        self._indexes: dict[str, int] = {}
+
+    def encode(self, values) -> pa.DictionaryArray:
+        indexes = [
+            (
+                None
+                if value is None
+                else self._indexes.setdefault(value, len(self._indexes))
+            )
+            for value in values
+        ]
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indexes, type=pa.int32()),
+            pa.array(list(self._indexes), type=pa.string()),
+        )
+
+
+def export_table(table: Table, file_path: str, export_format: str) -> int:
+    """
+    Writing the table into the file by record batches.
+
+    Parameters:
+        table: Table - the exported table
+        file_path: str - path of the written file
+        export_format: str - parquet or arrow
+
+    Returns:
+        int - the number of the written rows
+    """
+    rows_count = 0
+    encoders = {}
+
+    if export_format == ExportFormat.PARQUET:
+        schema = get_table_schema(table)
+        compression = settings.export_compression
+        if compression == "none":
+            compression = None
+
+        writer = pq.ParquetWriter(
+            file_path, schema, compression=compression, use_dictionary=True
+        )
+    elif export_format == ExportFormat.ARROW:
+        dictionary_columns = DICTIONARY_COLUMNS.get(table.name, set())
+        schema = get_table_schema(table, dictionary_columns)
+        encoders = {
+            column_name: DictionaryEncoder() for column_name in dictionary_columns
+        }
+        # The compressed buffers would be decompressed on reading,
+        # so the file is written without compression to be memory-mapped.
+        writer = pa.ipc.new_file(
+            file_path,
+            schema,
+            options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True),
+        )
+    else:
+        raise ValueError(f"Unknown export format: {export_format}")
+
+    with writer, SessionLocal() as db:
+        # The rows are fetched from the server side cursor by the batch size.
+        result = db.execute(
+            select(table)
+            .order_by(*table.primary_key.columns)
+            .execution_options(yield_per=settings.export_batch_size)
+        )
+
+        for rows in result.partitions():
+            writer.write_batch(
+                pa.record_batch(
+                    [
+                        encoders[field.name].encode(column_values)
+                        if field.name in encoders
+                        else pa.array(column_values, type=field.type)
+                        for column_values, field in zip(zip(*rows), schema)
+                    ],
+                    schema=schema,
+                )
+            )
+            rows_count += len(rows)
+
+    return rows_count
+
+
+def export_tables(output_dir: str, export_format: str = ExportFormat.PARQUET) -> None:
+    """Exporting all the element tables into the output directory, a file per table."""
+    os.makedirs(output_dir, exist_ok=True)
+
+    for table_name in EXPORTED_TABLES:
+        file_path = os.path.join(output_dir, f"{table_name}.{export_format}")
+        rows_count = export_table(
+            Base.metadata.tables[table_name], file_path, export_format
+        )
+        logging.info(f"{table_name}: {rows_count} rows are exported to {file_path}.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    export_tables("output/dataset", ExportFormat.PARQUET)
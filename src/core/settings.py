@@ -1,5 +1,7 @@
 """The project settings like the database connection URL."""
 
+import os
+
 from environs import Env
 
 env = Env()
@@ -13,6 +15,24 @@ class Settings:
 
     # Database settings.
     database_url = env("DATABASE_URL")
+    # With the async mode the parsers store the records with the async engine.
+    # The async url is made from the database url with the async driver, if it's not set.
+    database_async = env.bool("DATABASE_ASYNC", False)
+    database_async_url = env("DATABASE_ASYNC_URL", None)
+    # Connection pool settings, the recycle time is in seconds, -1 disables it.
+    # Pre ping checks every connection on checkout, it costs one round trip.
+    database_pool_size = env.int("DATABASE_POOL_SIZE", 5)
+    database_max_overflow = env.int("DATABASE_MAX_OVERFLOW", 10)
+    database_pool_recycle = env.int("DATABASE_POOL_RECYCLE", 1800)
+    database_pool_pre_ping = env.bool("DATABASE_POOL_PRE_PING", False)
+    # With the bulk load mode the new elements are loaded with COPY on PostgreSQL,
+    # it's meant for the initial full load with a larger PIPELINE_STORE_BATCH_SIZE.
+    database_bulk_load = env.bool("DATABASE_BULK_LOAD", False)
+    # SQLite settings, the database is used in the WAL mode.
+    # The busy timeout is in milliseconds.
+    sqlite_synchronous = env("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_mmap_size = env.int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)
+    sqlite_busy_timeout = env.int("SQLITE_BUSY_TIMEOUT", 5000)
 
     # Parser settings.
     request_headers = {
@@ -20,5 +40,89 @@ class Settings:
     }
     WANIKANI_BASE_URL = "https://www.wanikani.com"
 
+    # HTTP client settings.
+    # One connection pool is shared by all the parsers,
+    # these values tune its size and how long connections are kept.
+    http_connection_limit = env.int("HTTP_CONNECTION_LIMIT", 100)
+    http_connection_limit_per_host = env.int("HTTP_CONNECTION_LIMIT_PER_HOST", 10)
+    http_keepalive_timeout = env.float("HTTP_KEEPALIVE_TIMEOUT", 30)
+    http_dns_cache_ttl = env.int("HTTP_DNS_CACHE_TTL", 300)
+    http_timeout = env.float("HTTP_TIMEOUT", 60)
+
+    # Rate limiting settings.
+    # The rate is halved on every 429/503 response and slowly raised back,
+    # but it never goes below the minimum or above the maximum.
+    http_requests_per_second = env.float("HTTP_REQUESTS_PER_SECOND", 5)
+    http_min_requests_per_second = env.float("HTTP_MIN_REQUESTS_PER_SECOND", 0.5)
+    http_burst = env.int("HTTP_BURST", 10)
+    http_max_in_flight = env.int("HTTP_MAX_IN_FLIGHT", 10)
+    http_throttle_retries = env.int("HTTP_THROTTLE_RETRIES", 10)
+    http_default_retry_after = env.float("HTTP_DEFAULT_RETRY_AFTER", 5)
+    http_max_retry_after = env.float("HTTP_MAX_RETRY_AFTER", 300)
+
+    # Retry settings.
+    # Failed requests are retried with exponential backoff and jitter.
+    # Every request adds budget ratio to the retry budget and every retry takes one,
+    # so the retries are limited even if the host fails all the requests.
+    # After the threshold of failures in a row all the requests are paused.
+    http_max_attempts = env.int("HTTP_MAX_ATTEMPTS", 5)
+    http_backoff_base = env.float("HTTP_BACKOFF_BASE", 0.5)
+    http_backoff_max = env.float("HTTP_BACKOFF_MAX", 30)
+    http_retry_budget_ratio = env.float("HTTP_RETRY_BUDGET_RATIO", 0.2)
+    http_retry_budget_max = env.int("HTTP_RETRY_BUDGET_MAX", 50)
+    http_circuit_breaker_threshold = env.int("HTTP_CIRCUIT_BREAKER_THRESHOLD", 10)
+    http_circuit_breaker_reset_timeout = env.float("HTTP_CIRCUIT_BREAKER_RESET_TIMEOUT", 60)
+
+    # Media downloader settings.
+    media_max_concurrent_downloads = env.int("MEDIA_MAX_CONCURRENT_DOWNLOADS", 4)
+    media_chunk_size = env.int("MEDIA_CHUNK_SIZE", 64 * 1024)
+
+    # Response cache settings.
+    # Fresh pages are served from the cache, stale pages are revalidated
+    # with If-None-Match/If-Modified-Since. In the offline mode the network is not used at all.
+    http_cache_enabled = env.bool("HTTP_CACHE_ENABLED", True)
+    http_cache_offline = env.bool("HTTP_CACHE_OFFLINE", False)
+    http_cache_dir = env("HTTP_CACHE_DIR", "output/cache")
+    http_cache_ttl = env.float("HTTP_CACHE_TTL", 7 * 24 * 60 * 60)
+    http_cache_max_size = env.int("HTTP_CACHE_MAX_SIZE", 1024 * 1024 * 1024)
+
+    # Crawl frontier settings.
+    # Only the element pages are resumed, the list pages are loaded again on every pass.
+    # Frontier changes are checkpointed into the database every checkpoint size changes.
+    crawl_max_attempts = env.int("CRAWL_MAX_ATTEMPTS", 5)
+    crawl_checkpoint_size = env.int("CRAWL_CHECKPOINT_SIZE", 100)
+    crawl_pass_delay = env.float("CRAWL_PASS_DELAY", 60)
+    # With the refresh mode every pass loads all the pages again, the cached pages
+    # are revalidated with the server (unchanged pages answer with 304),
+    # the elements with the changed content are replaced, the unchanged ones are skipped.
+    crawl_refresh = env.bool("CRAWL_REFRESH", False)
+
+    # Pipeline settings.
+    # Pages go through the fetchers, the parse worker processes and the single writer.
+    # The stages are connected by the queues of the queue size, so a slow stage slows the previous one.
+    pipeline_fetch_workers = env.int("PIPELINE_FETCH_WORKERS", 10)
+    pipeline_parse_workers = env.int("PIPELINE_PARSE_WORKERS", os.cpu_count() or 1)
+    pipeline_queue_size = env.int("PIPELINE_QUEUE_SIZE", 100)
+    # The writer stores the records in batches of the batch size
+    # or the records collected during the batch timeout (in seconds), whichever comes first.
+    pipeline_store_batch_size = env.int("PIPELINE_STORE_BATCH_SIZE", 50)
+    pipeline_store_batch_timeout = env.float("PIPELINE_STORE_BATCH_TIMEOUT", 0.5)
+
+    # HTML parsing settings.
+    # The backend is a BeautifulSoup tree builder: lxml or html.parser.
+    # If lxml is not installed, html.parser is used.
+    # With sections only mode the parsers load only the page header and the sections they read.
+    # It's off by default until the strainer is checked on the real saved pages,
+    # a section, which is missed by the strainer, is stored as an empty field.
+    html_parser_backend = env("HTML_PARSER_BACKEND", "lxml")
+    html_parse_sections_only = env.bool("HTML_PARSE_SECTIONS_ONLY", False)
+
+    # Export settings.
+    # The exported elements are streamed from the database by batches of the batch size.
+    export_batch_size = env.int("EXPORT_BATCH_SIZE", 500)
+    # The compression codec of the Parquet files: zstd, lz4 or none.
+    # The Arrow files are not compressed, so they can be memory-mapped.
+    export_compression = env("EXPORT_COMPRESSION", "zstd")
+
 
 settings = Settings()
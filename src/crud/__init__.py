@@ -6,4 +6,6 @@ from .kanji_radical import CrudKanjiRadical
 from .word import CrudWord
 from .word_meaning import CrudWordMeaning
 from .word_use_pattern import CrudWordUsePattern
-from .word_context_sentence import CrudWordContextSentence
\ No newline at end of file
+from .word_context_sentence import CrudWordContextSentence
+from .crawl_url import CrudCrawlUrl
+from .bulk_loader import BulkLoader
\ No newline at end of file
@@ -1,6 +1,9 @@
 from typing import Generic, Type, TypeVar, Union
 
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ONETOMANY, RelationshipProperty, Session
 
 from src.database.session import Base
 
@@ -21,19 +24,144 @@ class CrudBase(Generic[ModelType]):
     def get(self, db: Session, obj_id: int) -> Union[ModelType, None]:
         return db.query(self.Model).filter(self.Model.id == obj_id).first()
 
+    def get_urls(self, db: Session) -> set[str]:
+        """
+        Getting the urls of all the objects in one query.
+        The model must have the url column.
+        """
+        return set(db.scalars(select(self.Model.url)))
+
+    async def get_urls_async(self, db: AsyncSession) -> set[str]:
+        """Getting the urls of all the objects like get_urls with the async session."""
+        return set(await db.scalars(select(self.Model.url)))
+
+    def get_content_hashes(self, db: Session, urls: list[str]) -> dict[str, str]:
+        """
+        Getting the content hashes of the objects by their urls.
+        The model must have the url and the content_hash columns.
+        """
+        return dict(
+            db.execute(
+                select(self.Model.url, self.Model.content_hash).where(
+                    self.Model.url.in_(urls)
+                )
+            ).all()
+        )
+
     def create(self, db: Session, db_obj: ModelType) -> ModelType:
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
-    def create_many(self, db: Session, db_objs: list[ModelType]) -> list[ModelType]:
+    def create_many_with_children(
+        self, db: Session, db_objs: list[ModelType]
+    ) -> list[ModelType]:
+        """
+        Inserting the objects together with the children,
+        which are attached to their relationships, in one transaction.
+        The children are inserted by the same flush, so nothing is stored if any insert fails.
+        The objects are not refreshed after the commit.
+        """
         db.add_all(db_objs)
         db.commit()
-        for db_obj in db_objs:
-            db.refresh(db_obj)
         return db_objs
 
+    async def create_many_with_children_async(
+        self, db: AsyncSession, db_objs: list[ModelType]
+    ) -> list[ModelType]:
+        """Inserting the objects like create_many_with_children with the async session."""
+        db.add_all(db_objs)
+        await db.commit()
+        return db_objs
+
+    def create_many(
+        self, db: Session, db_objs: list[ModelType], hydrate: bool = True
+    ) -> list[ModelType]:
+        """
+        Inserting the objects with the executemany batches.
+        The generated ids are returned by the same statement and set on the objects,
+        so the objects are not refreshed and are not added into the session.
+
+        **Parameters**
+
+        * `db_objs`: the objects to insert
+        * `hydrate`: if False, the ids are not returned, and the objects are not changed
+        """
+        self.insert_many(db, db_objs, hydrate)
+        db.commit()
+        return db_objs
+
+    def insert_many(
+        self, db: Session, db_objs: list[ModelType], hydrate: bool = True
+    ) -> None:
+        """Inserting the objects like create_many, but without the commit."""
+        # The objects are inserted in groups with the same set of the columns,
+        # the columns, which are not set, get their defaults.
+        groups: dict[tuple[str, ...], list[tuple[ModelType, dict]]] = {}
+
+        for db_obj in db_objs:
+            values = self._get_column_values(db_obj)
+            groups.setdefault(tuple(values), []).append((db_obj, values))
+
+        for group in groups.values():
+            params = [values for _, values in group]
+
+            if not hydrate:
+                db.execute(insert(self.Model), params)
+                continue
+
+            obj_ids = db.scalars(
+                insert(self.Model).returning(
+                    self.Model.id, sort_by_parameter_order=True
+                ),
+                params,
+            ).all()
+
+            for (db_obj, _), obj_id in zip(group, obj_ids):
+                db_obj.id = obj_id
+
+    def upsert_many_with_children(
+        self, db: Session, db_objs: list[ModelType]
+    ) -> list[ModelType]:
+        """
+        Inserting the objects or updating them by the url in one transaction,
+        the children collections, which are set on the objects, are replaced.
+        The objects with the same content hash as the stored ones are skipped.
+        The model must have the url and the content_hash columns.
+
+        Returns:
+            list[ModelType] - the objects which are written
+        """
+        stored_hashes = self.get_content_hashes(db, [db_obj.url for db_obj in db_objs])
+        changed_objs = [
+            db_obj
+            for db_obj in db_objs
+            if db_obj.content_hash is None
+            or stored_hashes.get(db_obj.url) != db_obj.content_hash
+        ]
+
+        for db_obj in changed_objs:
+            obj_id = self._upsert_by_url(db, self._get_column_values(db_obj))
+            self._replace_children(db, db_obj, obj_id)
+
+        db.commit()
+        return changed_objs
+
+    def get_children(
+        self, db_obj: ModelType
+    ) -> list[tuple[RelationshipProperty, list]]:
+        """
+        Getting the children collections, which are set on the object,
+        with their one to many relationships.
+        """
+        return [
+            (relationship, getattr(db_obj, relationship.key))
+            for relationship in inspect(self.Model).relationships
+            if relationship.direction is ONETOMANY
+            and relationship.key in db_obj.__dict__
+        ]
+
     def update(self, db: Session, db_obj: ModelType) -> ModelType:
         db.commit()
         db.refresh(db_obj)
@@ -43,3 +171,57 @@ class CrudBase(Generic[ModelType]):
         obj = db.query(self.Model).get(id)
         db.delete(obj)
         db.commit()
+
+    def _get_column_values(self, db_obj: ModelType) -> dict:
+        """Getting the values of the columns, which are set on the object."""
+        values = {}
+
+        for column_attr in inspect(self.Model).column_attrs:
+            value = getattr(db_obj, column_attr.key)
+            if value is not None:
+                values[column_attr.key] = value
+
+        return values
+
+    def _upsert_by_url(self, db: Session, values: dict) -> int:
+        """
+        Inserting the row with INSERT ... ON CONFLICT (url) DO UPDATE.
+        All the columns except the primary key, the url and created_at are updated,
+        so the columns, which are not set on the object anymore, become NULL.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            statement = postgresql.insert(self.Model)
+        else:
+            statement = sqlite.insert(self.Model)
+
+        statement = statement.values(values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.Model.url],
+            set_={
+                column.name: statement.excluded[column.name]
+                for column in self.Model.__table__.columns
+                if not column.primary_key and column.name not in ("url", "created_at")
+            },
+        ).returning(self.Model.id)
+
+        return db.scalar(statement)
+
+    def _replace_children(self, db: Session, db_obj: ModelType, obj_id: int) -> None:
+        """Replacing the stored children with the children set on the object."""
+        for relationship, children in self.get_children(db_obj):
+            Child = relationship.mapper.class_
+            (foreign_key,) = relationship.remote_side
+
+            db.execute(delete(Child).where(foreign_key == obj_id))
+
+            if not children:
+                continue
+
+            child_crud = CrudBase(Child)
+            db.execute(
+                insert(Child),
+                [
+                    {**child_crud._get_column_values(child), foreign_key.key: obj_id}
+                    for child in children
+                ],
+            )
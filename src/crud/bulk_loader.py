@@ -0,0 +1,265 @@
+"""
+Bulk loading of the parsed objects for the initial full loads.
+"""
+import datetime
+import io
+from typing import Iterator
+
+from sqlalchemy import Column, insert, text
+from sqlalchemy.orm import Session
+
+from src.crud.base import CrudBase, ModelType
+
+
+class CopyRowsReader(io.TextIOBase):
+    """
+    File-like object, which reads the COPY lines from the iterator on demand,
+    so the rows are formatted while the driver sends them and are not kept in memory.
+    """
+
+    def __init__(self, lines: Iterator[str]) -> None:
+        self._lines = lines
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> str:
+        chunks = [self._buffer]
+        buffered_size = len(self._buffer)
+
+        while size is None or size < 0 or buffered_size < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+
+            chunks.append(line)
+            buffered_size += len(line)
+
+        data = "".join(chunks)
+
+        if size is None or size < 0:
+            size = len(data)
+
+        self._buffer = data[size:]
+        return data[:size]
+
+
+class BulkLoader(CrudBase[ModelType]):
+    """
+    Loading many objects together with their children collections in one transaction.
+
+    On PostgreSQL the rows are streamed with COPY FROM STDIN
+    into the temporary staging tables, then they are moved into the real tables with INSERT ... SELECT,
+    the children get the ids of their parents by joining the parents on the url.
+    On the other databases the rows are inserted with the executemany batches.
+    The model must have the url column.
+    """
+
+    def load(self, db: Session, db_objs: list[ModelType]) -> None:
+        if not db_objs:
+            return
+
+        cursor = db.connection().connection.cursor()
+
+        # COPY is available only with the psycopg2 driver.
+        is_postgresql = db.get_bind().dialect.name == "postgresql"
+
+        if is_postgresql and hasattr(cursor, "copy_expert"):
+            self._copy(db, cursor, db_objs)
+        else:
+            self._insert(db, db_objs)
+
+        cursor.close()
+        db.commit()
+
+    def _insert(self, db: Session, db_objs: list[ModelType]) -> None:
+        self.insert_many(db, db_objs)
+
+        # The children rows of all objects are grouped by the relationships,
+        # so every relationship is inserted with one executemany batch.
+        children_rows = {}
+
+        for db_obj in db_objs:
+            for relationship, children in self.get_children(db_obj):
+                Child = relationship.mapper.class_
+                (foreign_key,) = relationship.remote_side
+                child_crud = CrudBase(Child)
+
+                children_rows.setdefault(relationship, []).extend(
+                    {
+                        **child_crud._get_column_values(child),
+                        foreign_key.key: db_obj.id,
+                    }
+                    for child in children
+                )
+
+        for relationship, rows in children_rows.items():
+            if rows:
+                db.execute(insert(relationship.mapper.class_), rows)
+
+    def _copy(self, db: Session, cursor, db_objs: list[ModelType]) -> None:
+        table = self.Model.__table__
+        columns = self._get_copied_columns(table.columns)
+
+        staging_table = self._create_staging_table(db, table.name, columns)
+        self._copy_rows(
+            cursor,
+            staging_table,
+            columns,
+            (
+                [getattr(db_obj, column.key) for column in columns]
+                for db_obj in db_objs
+            ),
+        )
+
+        column_names = ", ".join(column.name for column in columns)
+        db.execute(
+            text(
+                f"INSERT INTO {table.name} ({column_names}) "
+                f"SELECT {column_names} FROM {staging_table}"
+            )
+        )
+
+        # The children rows are grouped by the relationships
+        # and copied with the urls of their parents.
+        children_rows = {}
+
+        for db_obj in db_objs:
+            for relationship, children in self.get_children(db_obj):
+                children_rows.setdefault(relationship, []).extend(
+                    (db_obj.url, child) for child in children
+                )
+
+        for relationship, rows in children_rows.items():
+            if rows:
+                self._copy_children(db, cursor, relationship, rows)
+
+    def _copy_children(self, db: Session, cursor, relationship, rows: list) -> None:
+        child_table = relationship.mapper.class_.__table__
+        (foreign_key,) = relationship.remote_side
+        columns = [
+            column
+            for column in self._get_copied_columns(child_table.columns)
+            if column is not foreign_key
+        ]
+
+        staging_table = self._create_staging_table(
+            db, child_table.name, columns, with_parent_url=True
+        )
+        self._copy_rows(
+            cursor,
+            staging_table,
+            columns,
+            (
+                [getattr(child, column.key) for column in columns] + [parent_url]
+                for parent_url, child in rows
+            ),
+            with_parent_url=True,
+        )
+
+        column_names = ", ".join(column.name for column in columns)
+        staging_column_names = ", ".join(f"staging.{column.name}" for column in columns)
+        db.execute(
+            text(
+                f"INSERT INTO {child_table.name} ({column_names}, {foreign_key.name}) "
+                f"SELECT {staging_column_names}, parent.id "
+                f"FROM {staging_table} staging "
+                f"JOIN {self.Model.__table__.name} parent "
+                "ON parent.url = staging.parent_url"
+            )
+        )
+
+    def _create_staging_table(
+        self,
+        db: Session,
+        table_name: str,
+        columns: list[Column],
+        with_parent_url: bool = False,
+    ) -> str:
+        """
+        Creating the temporary table with the columns of the table.
+        It's dropped on the commit.
+        """
+        staging_table = f"staging_{table_name}"
+        column_names = ", ".join(column.name for column in columns)
+
+        db.execute(
+            text(
+                f"CREATE TEMPORARY TABLE {staging_table} ON COMMIT DROP AS "
+                f"SELECT {column_names} FROM {table_name} WITH NO DATA"
+            )
+        )
+
+        if with_parent_url:
+            db.execute(
+                text(f"ALTER TABLE {staging_table} ADD COLUMN parent_url VARCHAR")
+            )
+
+        return staging_table
+
+    def _copy_rows(
+        self,
+        cursor,
+        staging_table: str,
+        columns: list[Column],
+        rows,
+        with_parent_url: bool = False,
+    ) -> None:
+        """
+        Streaming the rows into the staging table in the COPY text format.
+        The lines are formatted from the rows iterator while the driver reads them.
+        """
+        column_names = [column.name for column in columns]
+        if with_parent_url:
+            column_names.append("parent_url")
+
+        cursor.copy_expert(
+            f"COPY {staging_table} ({', '.join(column_names)}) FROM STDIN",
+            CopyRowsReader(self._format_copy_lines(columns, rows)),
+        )
+
+    def _format_copy_lines(self, columns: list[Column], rows) -> Iterator[str]:
+        """Formatting the rows into the COPY text format lines one by one."""
+        for row in rows:
+            values = [
+                self._get_default(column) if value is None else value
+                for column, value in zip(columns, row)
+            ] + row[len(columns) :]
+            yield "\t".join(map(self._format_copy_value, values)) + "\n"
+
+    @staticmethod
+    def _get_copied_columns(columns) -> list[Column]:
+        """Getting the columns without the primary key, it's generated by the database."""
+        return [column for column in columns if not column.primary_key]
+
+    @staticmethod
+    def _get_default(column: Column):
+        """Getting the python side default of the column, which is skipped by COPY."""
+        if column.default is None or column.default.is_sequence:
+            return None
+
+        if column.default.is_callable:
+            return column.default.arg(None)
+
+        return column.default.arg
+
+    @staticmethod
+    def _format_copy_value(value) -> str:
+        """Formatting the value for the COPY text format."""
+        if value is None:
+            return "\\N"
+
+        if isinstance(value, bool):
+            return "t" if value else "f"
+
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.isoformat()
+
+        return (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
@@ -0,0 +1,46 @@
+"""
+CRUD requests for the crawl frontier.
+"""
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from src.crud.base import CrudBase
+from src.models import CrawlUrl
+
+
+class CrudCrawlUrl(CrudBase[CrawlUrl]):
+    def __init__(self, Model: type[CrawlUrl]):
+        super().__init__(Model)
+
+    def get_by_entity_type(self, db: Session, entity_type: str) -> list[CrawlUrl]:
+        """Getting all the frontier urls of the entity type in the discovery order."""
+        return (
+            db.query(CrawlUrl)
+            .filter(CrawlUrl.entity_type == entity_type)
+            .order_by(CrawlUrl.id)
+            .all()
+        )
+
+    def save_states(
+        self, db: Session, new_rows: list[dict], changed_rows: list[dict]
+    ) -> dict[str, int]:
+        """
+        Saving the frontier states in one transaction.
+        New rows are inserted, changed rows are updated by the primary key.
+
+        Returns:
+            dict[str, int] - the ids of the inserted rows by url.
+        """
+        inserted_ids = {}
+
+        if new_rows:
+            inserted = db.execute(
+                insert(CrawlUrl).returning(CrawlUrl.id, CrawlUrl.url), new_rows
+            )
+            inserted_ids = {url: obj_id for obj_id, url in inserted}
+
+        if changed_rows:
+            db.execute(update(CrawlUrl), changed_rows)
+
+        db.commit()
+        return inserted_ids
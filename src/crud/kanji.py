@@ -1,10 +1,12 @@
 """
 CRUD requests for the kanji.
 """
-from sqlalchemy.orm import Session
+from typing import Iterator
+
+from sqlalchemy.orm import Query, Session, selectinload
 
 from src.crud.base import CrudBase
-from src.models import Kanji
+from src.models import Kanji, KanjiRadical
 
 
 class CrudKanji(CrudBase[Kanji]):
@@ -23,3 +25,36 @@ class CrudKanji(CrudBase[Kanji]):
         """Getting the kanji which have level lower than before_level."""
         return db.query(Kanji).filter(Kanji.level <= before_level).all()
 
+    def get_by_level_with_children(self, db: Session, before_level: int) -> list[Kanji]:
+        """
+        Getting the kanji which have level lower than before_level
+        together with their radicals, readings and meanings.
+        Every collection is loaded by one query for all the kanji,
+        so the number of the queries doesn't depend on the number of the kanji.
+        """
+        return self._query_by_level_with_children(db, before_level).all()
+
+    def iter_by_level_with_children(
+        self, db: Session, before_level: int, batch_size: int
+    ) -> Iterator[Kanji]:
+        """
+        Streaming the kanji like get_by_level_with_children.
+        The kanji are fetched from the server side cursor by batches of batch_size,
+        and the children are loaded for every batch.
+        The iterator must be consumed while the session is open.
+        """
+        return self._query_by_level_with_children(db, before_level).yield_per(
+            batch_size
+        )
+
+    def _query_by_level_with_children(self, db: Session, before_level: int) -> Query:
+        return (
+            db.query(Kanji)
+            .filter(Kanji.level <= before_level)
+            .options(
+                selectinload(Kanji.radicals).joinedload(KanjiRadical.radical),
+                selectinload(Kanji.readings),
+                selectinload(Kanji.meanings),
+            )
+            .order_by(Kanji.level, Kanji.id)
+        )
@@ -1,6 +1,7 @@
 """
 CRUD requests for the WaniKani radicals.
 """
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.crud.base import CrudBase
@@ -33,4 +34,22 @@ class CrudWKRadical(CrudBase[WKRadical]):
 
     def get_by_url(self, db: Session, url: str) -> WKRadical:
         """Getting the wanikani radcial object by its url."""
-        return db.query(WKRadical).filter(WKRadical.url == url).first()
\ No newline at end of file
+        return db.query(WKRadical).filter(WKRadical.url == url).first()
+
+    def get_ids_with_keys(self, db: Session) -> list[tuple[int, str, str]]:
+        """Getting the ids, meanings and urls of all the wanikani radicals in one query."""
+        return [
+            tuple(row)
+            for row in db.execute(
+                select(WKRadical.id, WKRadical.meaning, WKRadical.url)
+            )
+        ]
+
+    def get_by_level(self, db: Session, before_level: int) -> list[WKRadical]:
+        """Getting the wanikani radicals which have level lower than before_level."""
+        return (
+            db.query(WKRadical)
+            .filter(WKRadical.level <= before_level)
+            .order_by(WKRadical.level, WKRadical.id)
+            .all()
+        )
@@ -1,7 +1,9 @@
 """
 CRUD requests for the words.
 """
-from sqlalchemy.orm import Session
+from typing import Iterator
+
+from sqlalchemy.orm import Query, Session, selectinload
 
 from src.crud.base import CrudBase
 from src.models import Word
@@ -21,4 +23,41 @@ class CrudWord(CrudBase[Word]):
     
     def get_words_before_level(self, db: Session, before_level: int) -> list[Word]:
         """Get words by the level."""
-        return db.query(Word).filter(Word.level <= before_level).all()
\ No newline at end of file
+        return db.query(Word).filter(Word.level <= before_level).all()
+
+    def get_words_before_level_with_children(
+        self, db: Session, before_level: int
+    ) -> list[Word]:
+        """
+        Get words by the level together with their meanings,
+        context sentences and use patterns.
+        Every collection is loaded by one query for all the words.
+        """
+        return self._query_words_before_level_with_children(db, before_level).all()
+
+    def iter_words_before_level_with_children(
+        self, db: Session, before_level: int, batch_size: int
+    ) -> Iterator[Word]:
+        """
+        Stream words like get_words_before_level_with_children.
+        The words are fetched from the server side cursor by batches of batch_size,
+        and the children are loaded for every batch.
+        The iterator must be consumed while the session is open.
+        """
+        return self._query_words_before_level_with_children(
+            db, before_level
+        ).yield_per(batch_size)
+
+    def _query_words_before_level_with_children(
+        self, db: Session, before_level: int
+    ) -> Query:
+        return (
+            db.query(Word)
+            .filter(Word.level <= before_level)
+            .options(
+                selectinload(Word.meanings),
+                selectinload(Word.context_sentences),
+                selectinload(Word.use_patterns),
+            )
+            .order_by(Word.level, Word.id)
+        )
@@ -1 +1 @@
-from .session import Base, SessionLocal, engine
+from .session import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
\ No newline at end of file
@@ -1,13 +1,101 @@
 """
 Creating a database engine with SqlAlchemy.
+The async engine is created only if the async mode is enabled in the settings.
+PostgreSQL and SQLite databases are supported.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from src.core import settings
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+# The async drivers of the database backends.
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def get_engine_options(database_url: str) -> dict:
+    """Getting the engine options from the settings for the database url."""
+    url = make_url(database_url)
+
+    # The in memory SQLite database lives in one connection, so the pool isn't configured.
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+
+    options = {
+        "pool_recycle": settings.database_pool_recycle,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+    }
+
+    # Only the queue pools have the size, for example, aiosqlite uses NullPool.
+    pool_class = url.get_dialect().get_pool_class(url)
+    if issubclass(pool_class, QueuePool):
+        options["pool_size"] = settings.database_pool_size
+        options["max_overflow"] = settings.database_max_overflow
+
+    return options
+
+
+def set_sqlite_pragmas(sync_engine: Engine) -> None:
+    """Setting the pragmas on every new connection, if the database is SQLite."""
+    if sync_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        # The readers don't block the writer in the WAL mode,
+        # and with the normal synchronous mode the commits don't wait for fsync.
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout}")
+        # The cascade deletes need the foreign keys.
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+engine = create_engine(
+    settings.database_url, **get_engine_options(settings.database_url)
+)
+set_sqlite_pragmas(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Replacing the driver of the database url with the async one."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"There is no async driver for the {backend} database.")
+
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+if settings.database_async:
+    async_database_url = settings.database_async_url or get_async_database_url(
+        settings.database_url
+    )
+    async_engine = create_async_engine(
+        async_database_url, **get_engine_options(async_database_url)
+    )
+    set_sqlite_pragmas(async_engine.sync_engine)
+
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
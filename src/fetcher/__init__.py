@@ -0,0 +1,4 @@
+from .cache import ResponseCache
+from .media import MediaDownloader
+from .rate_limiter import RateLimiter
+from .session import Fetcher
@@ -0,0 +1,256 @@
+"""
+On-disk cache of the fetched pages.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+
+class CacheEntry:
+    """
+    Cached response metadata.
+    The page body itself is stored separately under the hash of its content,
+    so the same body is stored once even if several urls return it.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        body_hash: str,
+        size: int,
+        stored_at: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        self.url = url
+        self.body_hash = body_hash
+        self.size = size
+        self.stored_at = stored_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Checking if the entry can be served without revalidation."""
+        return time.time() - self.stored_at < ttl
+
+    def get_conditional_headers(self) -> dict[str, str]:
+        """Getting the headers to revalidate the entry."""
+        headers = {}
+
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "body_hash": self.body_hash,
+            "size": self.size,
+            "stored_at": self.stored_at,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CacheEntry":
+        return cls(**data)
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of the page bodies keyed by url.
+
+    The cache directory has two folders:
+    - index — one json file with the CacheEntry per url, named by the hash of the url;
+    - bodies — the page bodies, named by the hash of the body.
+
+    The index is loaded into memory on the first access.
+    If the total size of the bodies is bigger than max_size,
+    the least recently stored entries are evicted,
+    except the stored one, even if its body alone is bigger than max_size.
+    The methods do blocking file IO, so the fetcher calls them in a thread.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float, max_size: int) -> None:
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._index_dir = os.path.join(cache_dir, "index")
+        self._bodies_dir = os.path.join(cache_dir, "bodies")
+        self._entries: dict[str, CacheEntry] | None = None
+        self._body_refs: dict[str, int] = {}
+        self._total_size = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> tuple[CacheEntry, str] | None:
+        """
+        Getting the cached entry and the page body by url.
+
+        Returns:
+            tuple[CacheEntry, str] | None - the entry and the body or None, if the url is not cached.
+        """
+        with self._lock:
+            entry = self._get_entries().get(url)
+
+        if entry is None:
+            return None
+
+        try:
+            with open(self._get_body_path(entry.body_hash), encoding="utf-8") as file:
+                return entry, file.read()
+        except FileNotFoundError:
+            logging.warning(f"Cached body for {url} is missing.")
+            return None
+
+    def store(
+        self, url: str, body: str, etag: str | None, last_modified: str | None
+    ) -> None:
+        """
+        Storing the page body with its validators.
+
+        Parameters:
+            url: str - the page url
+            body: str - the page body
+            etag: str | None - the ETag header value
+            last_modified: str | None - the Last-Modified header value
+        """
+        body_bytes = body.encode("utf-8")
+        body_hash = hashlib.sha256(body_bytes).hexdigest()
+
+        entry = CacheEntry(
+            url=url,
+            body_hash=body_hash,
+            size=len(body_bytes),
+            stored_at=time.time(),
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+        # The body is written under the lock, so the eviction can't remove it
+        # before the entry referencing it is added.
+        with self._lock:
+            body_path = self._get_body_path(body_hash)
+
+            if not os.path.exists(body_path):
+                self._write_atomically(body_path, body_bytes)
+
+            self._put_entry(entry)
+            self._evict(keep_url=url)
+
+    def touch(self, url: str) -> None:
+        """Marking the entry as fresh after the server confirmed it with 304."""
+        with self._lock:
+            entry = self._get_entries().get(url)
+
+            if entry is None:
+                return
+
+            entry.stored_at = time.time()
+            self._write_entry(entry)
+
+    def _get_entries(self) -> dict[str, CacheEntry]:
+        if self._entries is not None:
+            return self._entries
+
+        os.makedirs(self._index_dir, exist_ok=True)
+        os.makedirs(self._bodies_dir, exist_ok=True)
+
+        self._entries = {}
+
+        for file_name in os.listdir(self._index_dir):
+            if not file_name.endswith(".json"):
+                continue
+
+            try:
+                with open(os.path.join(self._index_dir, file_name), encoding="utf-8") as file:
+                    entry = CacheEntry.from_dict(json.load(file))
+            except (OSError, ValueError, TypeError):
+                logging.warning(f"Skipping the broken cache index file {file_name}.")
+                continue
+
+            self._add_to_memory(entry)
+
+        return self._entries
+
+    def _put_entry(self, entry: CacheEntry) -> None:
+        entries = self._get_entries()
+        old_entry = entries.get(entry.url)
+
+        if old_entry is not None:
+            self._remove_from_memory(old_entry)
+
+        self._add_to_memory(entry)
+        self._write_entry(entry)
+
+        if old_entry is not None and old_entry.body_hash not in self._body_refs:
+            self._remove_file(self._get_body_path(old_entry.body_hash))
+
+    def _evict(self, keep_url: str) -> None:
+        """Evicting the oldest entries except the entry of keep_url."""
+        if self._total_size <= self.max_size:
+            return
+
+        for entry in sorted(self._entries.values(), key=lambda entry: entry.stored_at):
+            if self._total_size <= self.max_size:
+                break
+
+            if entry.url == keep_url:
+                continue
+
+            self._remove_from_memory(entry)
+            self._remove_file(self._get_index_path(entry.url))
+
+            if entry.body_hash not in self._body_refs:
+                self._remove_file(self._get_body_path(entry.body_hash))
+
+    def _add_to_memory(self, entry: CacheEntry) -> None:
+        self._entries[entry.url] = entry
+
+        if entry.body_hash not in self._body_refs:
+            self._total_size += entry.size
+
+        self._body_refs[entry.body_hash] = self._body_refs.get(entry.body_hash, 0) + 1
+
+    def _remove_from_memory(self, entry: CacheEntry) -> None:
+        del self._entries[entry.url]
+        self._body_refs[entry.body_hash] -= 1
+
+        if self._body_refs[entry.body_hash] == 0:
+            del self._body_refs[entry.body_hash]
+            self._total_size -= entry.size
+
+    def _write_entry(self, entry: CacheEntry) -> None:
+        self._write_atomically(
+            self._get_index_path(entry.url),
+            json.dumps(entry.to_dict()).encode("utf-8"),
+        )
+
+    def _write_atomically(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+
+        os.replace(temporary_path, path)
+
+    def _remove_file(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _get_index_path(self, url: str) -> str:
+        url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self._index_dir, f"{url_hash}.json")
+
+    def _get_body_path(self, body_hash: str) -> str:
+        return os.path.join(self._bodies_dir, body_hash)
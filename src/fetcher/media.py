@@ -0,0 +1,176 @@
+"""
+Downloading the media files like the reading audio and the radical images.
+"""
+
+import asyncio
+import logging
+import os
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from src.core import settings
+
+if TYPE_CHECKING:
+    from src.fetcher.session import Fetcher
+
+
+def parse_content_range(value: str | None) -> tuple[int | None, int | None]:
+    """
+    Parsing the Content-Range header value,
+    e.g. "bytes 100-199/1234" of the 206 response or "bytes */1234" of the 416 response.
+
+    Parameters:
+        value: str | None - the header value
+
+    Returns:
+        tuple[int | None, int | None] - the first byte position and the complete length,
+        each of them is None, if it's missing, unknown or invalid.
+    """
+    if not value or not value.strip().startswith("bytes "):
+        return None, None
+
+    byte_range, _, total = value.strip()[len("bytes ") :].partition("/")
+    start, _, _ = byte_range.partition("-")
+
+    return (
+        int(start) if start.isdigit() else None,
+        int(total) if total.isdigit() else None,
+    )
+
+
+class IncompleteDownloadError(Exception):
+    """The downloaded file is smaller than the Content-Length, the download can be resumed."""
+
+
+class MediaDownloader:
+    """
+    Asynchronous media downloader.
+    Files are streamed to disk in chunks into a temporary ".part" file,
+    which is renamed to the final name only after the whole file is downloaded.
+    If a ".part" file is left by the previous attempt or run,
+    the download is resumed with a Range request.
+    The downloader has its own concurrency limit, so big files don't take the page fetch slots.
+    """
+
+    def __init__(self, fetcher: "Fetcher") -> None:
+        self.fetcher = fetcher
+        self._semaphore = asyncio.Semaphore(settings.media_max_concurrent_downloads)
+
+    async def download(self, file_url: str, file_path_to_save: str) -> bool:
+        """
+        Downloads the file from the provided url.
+        File will be saved in the file_path_to_save.
+
+        Parameters:
+            file_url: str - file url to download from.
+            file_path_to_save: str - file path to save.
+
+        Returns:
+            bool - True, if the file is downloaded completely.
+        """
+        if os.path.exists(file_path_to_save):
+            return True
+
+        failed_attempts = 0
+        self.fetcher.retry_policy.record_request()
+
+        async with self._semaphore:
+            while True:
+                try:
+                    return await self._download_once(file_url, file_path_to_save)
+                except (aiohttp.ClientError, asyncio.TimeoutError, IncompleteDownloadError) as e:
+                    failed_attempts += 1
+
+                    if not self.fetcher.retry_policy.try_retry(failed_attempts):
+                        logging.critical(
+                            f"Giving up on {file_url} after {failed_attempts} attempts: {e!r}"
+                        )
+                        return False
+
+                    # The next attempt resumes from the already downloaded part.
+                    delay = self.fetcher.retry_policy.get_delay(failed_attempts)
+                    logging.warning(
+                        f"Download of {file_url} failed: {e!r}. Retrying in {delay:.1f} seconds."
+                    )
+                    await asyncio.sleep(delay)
+
+    async def _download_once(self, file_url: str, file_path_to_save: str) -> bool:
+        """
+        Making one attempt to download the file.
+        Network errors and incomplete downloads are raised, so the download can be retried.
+        """
+        partial_file_path = f"{file_path_to_save}.part"
+        session = await self.fetcher.get_session()
+
+        # The second request is made only if the partial file can't be resumed.
+        for _ in range(2):
+            offset = 0
+            headers = {"Accept-Encoding": "identity"}
+
+            if os.path.exists(partial_file_path):
+                offset = os.path.getsize(partial_file_path)
+                headers["Range"] = f"bytes={offset}-"
+
+            async with session.get(file_url, headers=headers) as resp:
+                if resp.status == 416:
+                    # The partial file can be already complete,
+                    # e.g. the previous run stopped before the rename.
+                    _, total_size = parse_content_range(resp.headers.get("Content-Range"))
+
+                    if total_size is not None and offset == total_size:
+                        os.replace(partial_file_path, file_path_to_save)
+                        return True
+
+                    logging.warning(f"Can't resume {file_url}, downloading it again.")
+                    os.remove(partial_file_path)
+                    continue
+
+                if resp.status == 206:
+                    start, _ = parse_content_range(resp.headers.get("Content-Range"))
+
+                    # The other range can't be appended to the partial file.
+                    if start != offset:
+                        logging.warning(
+                            f"{file_url} is sent from byte {start} instead of {offset}, "
+                            "downloading it again."
+                        )
+                        if offset:
+                            os.remove(partial_file_path)
+                        continue
+                elif resp.status == 200:
+                    # The server ignored the Range header and sends the whole file,
+                    # it overwrites the partial file.
+                    offset = 0
+                else:
+                    logging.critical(f"Response code for {file_url} is {resp.status}!!!")
+                    return False
+
+                expected_size = None
+                if resp.content_length is not None:
+                    expected_size = offset + resp.content_length
+
+                # The chunks are written in the worker thread,
+                # so the slow disk doesn't block the event loop.
+                file = await asyncio.to_thread(
+                    open, partial_file_path, "ab" if offset else "wb"
+                )
+
+                try:
+                    async for chunk in resp.content.iter_chunked(settings.media_chunk_size):
+                        await asyncio.to_thread(file.write, chunk)
+                finally:
+                    file.close()
+
+            downloaded_size = os.path.getsize(partial_file_path)
+
+            if expected_size is not None and downloaded_size != expected_size:
+                raise IncompleteDownloadError(
+                    f"{file_url} is downloaded partially: "
+                    f"{downloaded_size} of {expected_size} bytes."
+                )
+
+            os.replace(partial_file_path, file_path_to_save)
+            return True
+
+        return False
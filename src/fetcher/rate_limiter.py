@@ -0,0 +1,134 @@
+"""
+Rate limiting of the requests to WaniKani.
+"""
+
+import asyncio
+import datetime
+import time
+from email.utils import parsedate_to_datetime
+
+from src.core import settings
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parsing the Retry-After header value.
+    The header can contain either the number of seconds or an HTTP date.
+
+    Parameters:
+        value: str | None - the header value
+
+    Returns:
+        float | None - the delay in seconds or None, if the header is missing or invalid.
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+
+    if value.isdigit():
+        delay = float(value)
+    else:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+
+        delay = (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+
+    return min(max(delay, 0.0), settings.http_max_retry_after)
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter with the cap of the requests in flight.
+    Tokens are refilled with the current rate up to the burst size,
+    every request takes one token and one in-flight slot.
+
+    The rate is adaptive: when the server answers with 429 or 503,
+    the rate is halved and all the requests are paused for Retry-After seconds,
+    after that every successful response raises the rate back to the configured maximum.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        burst: int,
+        max_in_flight: int,
+        min_requests_per_second: float,
+    ) -> None:
+        self.max_rate = requests_per_second
+        self.min_rate = min(min_requests_per_second, requests_per_second)
+        self.rate = requests_per_second
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+
+    async def acquire(self) -> None:
+        """Waiting for an in-flight slot and a token."""
+        await self._in_flight.acquire()
+
+        try:
+            await self._take_token()
+        except BaseException:
+            self._in_flight.release()
+            raise
+
+    def release(self) -> None:
+        """Releasing the in-flight slot."""
+        self._in_flight.release()
+
+    def throttle(self, retry_after: float | None = None) -> None:
+        """
+        Slowing down after the server asked for it with 429 or 503.
+
+        Parameters:
+            retry_after: float | None - the delay from the Retry-After header
+        """
+        if retry_after is None:
+            retry_after = settings.http_default_retry_after
+
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        self.rate = max(self.min_rate, self.rate / 2)
+
+        # The bucket starts filling again only after the pause.
+        self._tokens = 0.0
+        self._updated_at = self._paused_until
+
+    def on_success(self) -> None:
+        """Raising the rate back to the maximum after a successful response."""
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 100)
+
+    async def _take_token(self) -> None:
+        # The lock makes the waiters take the tokens in the arrival order.
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                elapsed = max(0.0, now - self._updated_at)
+                self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def __aenter__(self) -> "RateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
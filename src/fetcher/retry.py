@@ -0,0 +1,125 @@
+"""
+Retrying the failed requests and pausing the fetch layer when the host is down.
+"""
+
+import asyncio
+import logging
+import random
+import time
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter and a retry budget.
+    Every request adds budget_ratio to the budget (up to budget_max) and every retry takes one,
+    so the retries can't be more than a fixed share of the requests even if all of them fail.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        budget_ratio: float,
+        budget_max: int,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_max = budget_max
+        self._budget = float(budget_max)
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        Getting the delay before the next attempt.
+
+        Parameters:
+            attempt: int - the number of the failed attempts
+
+        Returns:
+            float - the delay in seconds
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def record_request(self) -> None:
+        """Adding the share of the request to the retry budget."""
+        self._budget = min(self.budget_max, self._budget + self.budget_ratio)
+
+    def try_retry(self, attempt: int) -> bool:
+        """
+        Checking if one more attempt is allowed and taking it from the budget.
+
+        Parameters:
+            attempt: int - the number of the failed attempts
+        """
+        if attempt >= self.max_attempts or self._budget < 1:
+            return False
+
+        self._budget -= 1
+        return True
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for the whole fetch layer.
+    After failure_threshold consecutive failures the circuit is opened
+    and all the requests wait for reset_timeout seconds.
+    After that only one probe request is let through:
+    if it succeeds the circuit is closed, otherwise it's opened again.
+    The probe slot is held by the task of the probe request
+    and it must be released with release_probe on any exit of the request.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe_task: asyncio.Task | None = None
+
+    async def wait(self) -> None:
+        """Waiting until the requests are allowed."""
+        while self._opened_at is not None:
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+            elif self._probe_task is None:
+                self._probe_task = asyncio.current_task()
+                return
+            else:
+                # Someone else is probing the host, waiting for the result.
+                await asyncio.sleep(1)
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logging.info("Host is responding again, closing the circuit.")
+
+        self._failures = 0
+        self._opened_at = None
+        self._probe_task = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_task = None
+
+        if self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logging.critical(
+                    f"{self._failures} requests failed in a row, "
+                    f"pausing all the requests for {self.reset_timeout} seconds."
+                )
+
+            self._opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """
+        Releasing the probe slot, if it's held by the current task.
+        It's called when the request ends without the result,
+        e.g. it's cancelled or it raises an unexpected exception,
+        so the other requests don't wait for the probe forever.
+        """
+        if self._probe_task is not None and self._probe_task is asyncio.current_task():
+            self._probe_task = None
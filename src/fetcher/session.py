@@ -0,0 +1,203 @@
+"""
+Creating a shared aiohttp session for all the parsers.
+"""
+
+import asyncio
+import logging
+
+import aiohttp
+
+from src.core import settings
+from src.fetcher.cache import ResponseCache
+from src.fetcher.media import MediaDownloader
+from src.fetcher.rate_limiter import RateLimiter, parse_retry_after
+from src.fetcher.retry import CircuitBreaker, RetryPolicy
+
+# Response codes, with which the server asks to slow down.
+THROTTLE_STATUSES = (429, 503)
+
+
+class ServerError(Exception):
+    """The server answered with 5xx response code, the request can be retried."""
+
+
+class Fetcher:
+    """
+    Fetch layer which is shared by all the parsers.
+    It keeps one long-lived aiohttp session with a pooled connector,
+    so the connections, TLS sessions and DNS lookups are reused between pages.
+    The session is created lazily, because it must be created inside a running event loop.
+    """
+
+    def __init__(self, headers: dict[str, str] | None = None) -> None:
+        self.headers = {
+            **(headers or settings.request_headers),
+            "Accept-Encoding": "gzip, deflate",
+        }
+        self._session: aiohttp.ClientSession | None = None
+        self.rate_limiter = RateLimiter(
+            requests_per_second=settings.http_requests_per_second,
+            burst=settings.http_burst,
+            max_in_flight=settings.http_max_in_flight,
+            min_requests_per_second=settings.http_min_requests_per_second,
+        )
+        self.retry_policy = RetryPolicy(
+            max_attempts=settings.http_max_attempts,
+            base_delay=settings.http_backoff_base,
+            max_delay=settings.http_backoff_max,
+            budget_ratio=settings.http_retry_budget_ratio,
+            budget_max=settings.http_retry_budget_max,
+        )
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=settings.http_circuit_breaker_threshold,
+            reset_timeout=settings.http_circuit_breaker_reset_timeout,
+        )
+        self.media_downloader = MediaDownloader(self)
+
+        self.cache: ResponseCache | None = None
+        if settings.http_cache_enabled:
+            self.cache = ResponseCache(
+                cache_dir=settings.http_cache_dir,
+                ttl=settings.http_cache_ttl,
+                max_size=settings.http_cache_max_size,
+            )
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Getting the shared session.
+        A new session is created if there is no session yet or it was closed.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.http_connection_limit,
+                limit_per_host=settings.http_connection_limit_per_host,
+                keepalive_timeout=settings.http_keepalive_timeout,
+                ttl_dns_cache=settings.http_dns_cache_ttl,
+                use_dns_cache=True,
+            )
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=settings.http_timeout),
+                auto_decompress=True,
+            )
+
+        return self._session
+
+    async def get_text(self, url: str, revalidate: bool = False) -> str | None:
+        """
+        Getting the page text.
+        Fresh pages are taken from the response cache, stale pages are revalidated.
+        With revalidate the cached pages are always revalidated with the server.
+        Every request goes through the circuit breaker and the rate limiter.
+        If the server answers with 429 or 503, the rate limiter is slowed down
+        and the request is repeated after the Retry-After delay.
+        Network errors and 5xx responses are retried with exponential backoff.
+
+        Parameters:
+            url: str - the url of the page to load
+            revalidate: bool - if True, the fresh cached page isn't used without a request
+
+        Returns:
+            str | None - the page text or None, if the page can't be loaded.
+        """
+        cached = None
+        request_headers = {}
+
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, url)
+
+        if cached is not None:
+            cache_entry, cached_text = cached
+
+            if settings.http_cache_offline or (
+                not revalidate and cache_entry.is_fresh(self.cache.ttl)
+            ):
+                return cached_text
+
+            request_headers = cache_entry.get_conditional_headers()
+
+        elif settings.http_cache_offline:
+            logging.warning(f"{url} is not cached, skipping it in the offline mode.")
+            return None
+
+        session = await self.get_session()
+        failed_attempts = 0
+        throttled_attempts = 0
+        self.retry_policy.record_request()
+
+        while True:
+            await self.circuit_breaker.wait()
+
+            try:
+                async with self.rate_limiter:
+                    async with session.get(url, headers=request_headers) as resp:
+                        if resp.status in THROTTLE_STATUSES:
+                            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                            self.rate_limiter.throttle(retry_after)
+                            # The host is alive, it just asks to slow down.
+                            self.circuit_breaker.record_success()
+                            logging.warning(
+                                f"Response code for {url} is {resp.status}, "
+                                f"slowing down to {self.rate_limiter.rate:.2f} requests per second."
+                            )
+                            throttled_attempts += 1
+
+                            if throttled_attempts > settings.http_throttle_retries:
+                                logging.critical(
+                                    f"{url} is still throttled after "
+                                    f"{settings.http_throttle_retries} retries!!!"
+                                )
+                                return None
+
+                            continue
+
+                        if resp.status >= 500:
+                            raise ServerError(f"Response code for {url} is {resp.status}")
+
+                        self.circuit_breaker.record_success()
+                        self.rate_limiter.on_success()
+
+                        if resp.status == 304 and cached is not None:
+                            await asyncio.to_thread(self.cache.touch, url)
+                            return cached_text
+
+                        if resp.status != 200:
+                            logging.critical(f"Response code for {url} is {resp.status}!!!")
+                            return None
+
+                        page_text = await resp.text()
+                        validators = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+
+            except (aiohttp.ClientError, asyncio.TimeoutError, ServerError) as e:
+                self.circuit_breaker.record_failure()
+                failed_attempts += 1
+
+                if not self.retry_policy.try_retry(failed_attempts):
+                    logging.critical(f"Giving up on {url} after {failed_attempts} attempts: {e!r}")
+                    return None
+
+                delay = self.retry_policy.get_delay(failed_attempts)
+                logging.warning(f"Request to {url} failed: {e!r}. Retrying in {delay:.1f} seconds.")
+                await asyncio.sleep(delay)
+                continue
+            finally:
+                self.circuit_breaker.release_probe()
+
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.store, url, page_text, *validators)
+
+            return page_text
+
+    async def close(self) -> None:
+        """Closing the session and all the pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+        self._session = None
+
+    async def __aenter__(self) -> "Fetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
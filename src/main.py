@@ -1,4 +1,5 @@
 import asyncio
+import signal
 import sys
 import time
 
@@ -7,33 +8,73 @@ sys.path.append("..")
 # Logging.
 import logging
 
-logging.basicConfig(level=logging.INFO, filename="logs/logs.log", filemode="w")
-
 import src.models
+from src.core import settings
+from src.database import Base, async_engine, engine
+from src.fetcher import Fetcher
+from src.parsers import KanjiParser, WKRadicalsParser, WordParser
+from src.parsers.pipeline import shutdown_process_pool
 
-# Database initialization.
-from src.database import Base, engine
 
-Base.metadata.create_all(engine)
+def run_parser(loop: asyncio.AbstractEventLoop, parser) -> None:
+    """
+    Running the parser until it's done.
+    SIGINT cancels the parser, so it checkpoints its frontier before the exit.
+    """
+    task = loop.create_task(parser.run())
+    loop.add_signal_handler(signal.SIGINT, task.cancel)
 
-from src.parsers import KanjiParser, WKRadicalsParser, WordParser
+    try:
+        loop.run_until_complete(task)
+    finally:
+        loop.remove_signal_handler(signal.SIGINT)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, filename="logs/logs.log", filemode="w")
+
+    # Database initialization.
+    Base.metadata.create_all(engine)
 
-word_parser = WordParser(is_download_audio=True)
-radicals_parser = WKRadicalsParser(is_download_image=True)
-kanji_parser = KanjiParser()
+    # All the parsers share one fetcher, so they share one connection pool.
+    fetcher = Fetcher()
 
-loop = asyncio.get_event_loop()
+    word_parser = WordParser(is_download_audio=True, fetcher=fetcher)
+    radicals_parser = WKRadicalsParser(is_download_image=True, fetcher=fetcher)
+    kanji_parser = KanjiParser(fetcher=fetcher)
+
+    loop = asyncio.get_event_loop()
 
-while True:
     try:
-        loop.run_until_complete(word_parser.run())
-        loop.run_until_complete(radicals_parser.run())
-        loop.run_until_complete(kanji_parser.run())
-    
-    except Exception as e:
-        logging.warning("Error while parsing. Relaunching after 10 seconds.")
-        logging.warning(e)
-        
-        for i in range(10, 0, -1):
-            logging.info(f"{i} second before relaunch...")
-            time.sleep(1)
\ No newline at end of file
+        while True:
+            try:
+                run_parser(loop, word_parser)
+                run_parser(loop, radicals_parser)
+                run_parser(loop, kanji_parser)
+
+                logging.info(
+                    f"Crawl pass is done. Next pass after {settings.crawl_pass_delay} seconds."
+                )
+                time.sleep(settings.crawl_pass_delay)
+
+            except asyncio.CancelledError:
+                logging.info("Interrupted. The crawl frontier is saved, exiting.")
+                break
+
+            except Exception as e:
+                logging.warning("Error while parsing. Relaunching after 10 seconds.")
+                logging.warning(e)
+
+                for i in range(10, 0, -1):
+                    logging.info(f"{i} second before relaunch...")
+                    time.sleep(1)
+    finally:
+        loop.run_until_complete(fetcher.close())
+        if async_engine is not None:
+            loop.run_until_complete(async_engine.dispose())
+        shutdown_process_pool()
+
+
+# The parse worker processes import this module too, so the crawl is started only in the main process.
+if __name__ == "__main__":
+    main()
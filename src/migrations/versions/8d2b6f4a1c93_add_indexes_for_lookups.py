@@ -0,0 +1,76 @@
+"""Add indexes for the lookups of the parsers and exporters
+
+Revision ID: 8d2b6f4a1c93
+Revises: 5c1f3e9a7b20
+Create Date: 2026-10-18 15:41:07.532190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2b6f4a1c93'
+down_revision: Union[str, None] = '5c1f3e9a7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The radicals could be stored twice before the url became unique,
+    # the kanji links are moved to the first copy and the other copies are removed.
+    op.execute(
+        """
+        UPDATE kanji_radicals
+        SET wk_radical_id = (
+            SELECT MIN(first_copy.id)
+            FROM wk_radicals first_copy
+            JOIN wk_radicals copy ON copy.url = first_copy.url
+            WHERE copy.id = kanji_radicals.wk_radical_id
+        )
+        WHERE wk_radical_id IN (
+            SELECT copy.id FROM wk_radicals copy
+            WHERE copy.id > (
+                SELECT MIN(first_copy.id) FROM wk_radicals first_copy
+                WHERE first_copy.url = copy.url
+            )
+        )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM wk_radicals
+        WHERE id > (
+            SELECT MIN(first_copy.id) FROM wk_radicals first_copy
+            WHERE first_copy.url = wk_radicals.url
+        )
+        """
+    )
+
+    op.create_index(op.f('ix_wk_radicals_url'), 'wk_radicals', ['url'], unique=True)
+    op.create_index(op.f('ix_wk_radicals_meaning'), 'wk_radicals', ['meaning'], unique=False)
+    op.create_index(op.f('ix_kanji_level'), 'kanji', ['level'], unique=False)
+    op.create_index(op.f('ix_words_level'), 'words', ['level'], unique=False)
+    op.create_index(op.f('ix_kanji_meanings_kanji_id'), 'kanji_meanings', ['kanji_id'], unique=False)
+    op.create_index(op.f('ix_kanji_readings_kanji_id'), 'kanji_readings', ['kanji_id'], unique=False)
+    op.create_index(op.f('ix_kanji_radicals_kanji_id'), 'kanji_radicals', ['kanji_id'], unique=False)
+    op.create_index(op.f('ix_kanji_radicals_wk_radical_id'), 'kanji_radicals', ['wk_radical_id'], unique=False)
+    op.create_index(op.f('ix_word_meanings_word_id'), 'word_meanings', ['word_id'], unique=False)
+    op.create_index(op.f('ix_word_context_sentences_word_id'), 'word_context_sentences', ['word_id'], unique=False)
+    op.create_index(op.f('ix_word_use_patterns_word_id'), 'word_use_patterns', ['word_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_word_use_patterns_word_id'), table_name='word_use_patterns')
+    op.drop_index(op.f('ix_word_context_sentences_word_id'), table_name='word_context_sentences')
+    op.drop_index(op.f('ix_word_meanings_word_id'), table_name='word_meanings')
+    op.drop_index(op.f('ix_kanji_radicals_wk_radical_id'), table_name='kanji_radicals')
+    op.drop_index(op.f('ix_kanji_radicals_kanji_id'), table_name='kanji_radicals')
+    op.drop_index(op.f('ix_kanji_readings_kanji_id'), table_name='kanji_readings')
+    op.drop_index(op.f('ix_kanji_meanings_kanji_id'), table_name='kanji_meanings')
+    op.drop_index(op.f('ix_words_level'), table_name='words')
+    op.drop_index(op.f('ix_kanji_level'), table_name='kanji')
+    op.drop_index(op.f('ix_wk_radicals_meaning'), table_name='wk_radicals')
+    op.drop_index(op.f('ix_wk_radicals_url'), table_name='wk_radicals')
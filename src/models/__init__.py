@@ -6,4 +6,5 @@ from .kanji_radical import KanjiRadical
 from .word import Word
 from .word_meaning import WordMeaning
 from .word_use_pattern import WordUsePattern
-from .word_context_sentence import WordContextSentence
\ No newline at end of file
+from .word_context_sentence import WordContextSentence
+from .crawl_url import CrawlState, CrawlUrl
\ No newline at end of file
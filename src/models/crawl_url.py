@@ -0,0 +1,29 @@
+"""A crawl frontier url SQLAlchemy model."""
+import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from src.database import Base
+
+
+class CrawlState:
+    DISCOVERED = "discovered"
+    FETCHED = "fetched"
+    PARSED = "parsed"
+    STORED = "stored"
+    FAILED = "failed"
+
+
+class CrawlUrl(Base):
+    __tablename__ = "crawl_frontier"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String, unique=True, index=True)
+    entity_type = Column(String, index=True)
+    state = Column(String, default=CrawlState.DISCOVERED)
+    attempts = Column(Integer, default=0)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(
+        DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow
+    )
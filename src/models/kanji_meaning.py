@@ -11,7 +11,7 @@ class KanjiMeaning(Base):
     __tablename__ = "kanji_meanings"
 
     id = Column(Integer, primary_key=True, index=True)
-    kanji_id = Column(Integer, ForeignKey("kanji.id", ondelete="CASCADE"))
+    kanji_id = Column(Integer, ForeignKey("kanji.id", ondelete="CASCADE"), index=True)
     meaning = Column(String)
     is_primary = Column(Boolean, default=False)
     mnemonic = Column(String, nullable=True)
@@ -11,8 +11,10 @@ class KanjiRadical(Base):
     __tablename__ = "kanji_radicals"
 
     id = Column(Integer, primary_key=True, index=True)
-    kanji_id = Column(Integer, ForeignKey("kanji.id", ondelete="CASCADE"))
-    wk_radical_id = Column(Integer, ForeignKey("wk_radicals.id", ondelete="CASCADE"))
+    kanji_id = Column(Integer, ForeignKey("kanji.id", ondelete="CASCADE"), index=True)
+    wk_radical_id = Column(
+        Integer, ForeignKey("wk_radicals.id", ondelete="CASCADE"), index=True
+    )
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
     kanji = relationship("Kanji", back_populates="radicals", uselist=False)
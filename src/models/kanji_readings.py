@@ -11,7 +11,7 @@ class KanjiReading(Base):
     __tablename__ = "kanji_readings"
 
     id = Column(Integer, primary_key=True, index=True)
-    kanji_id = Column(Integer, ForeignKey("kanji.id", ondelete="CASCADE"))
+    kanji_id = Column(Integer, ForeignKey("kanji.id", ondelete="CASCADE"), index=True)
     reading = Column(String)
     type = Column(String)
     mnemonic = Column(String, nullable=True)
@@ -13,11 +13,12 @@ class WKRadical(Base):
     id = Column(Integer, primary_key=True, index=True)
     level = Column(Integer)
     symbol = Column(String)
-    meaning = Column(String)
+    meaning = Column(String, index=True)
     mnemonic = Column(String)
     image_filename = Column(String, nullable=True)
     is_symbol_image = Column(Boolean, default=False)
-    url = Column(String)
+    url = Column(String, unique=True, index=True)
+    content_hash = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
     kanji = relationship("KanjiRadical", back_populates="radical")
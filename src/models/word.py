@@ -12,13 +12,14 @@ class Word(Base):
     __tablename__ = "words"
 
     id = Column(Integer, primary_key=True, index=True)
-    level = Column(Integer)
+    level = Column(Integer, index=True)
     url = Column(String, unique=True, index=True)
     symbols = Column(String)
     reading = Column(String)
     reading_explanation = Column(String)
     reading_audio_filename = Column(String)
     types = Column(String)
+    content_hash = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
     context_sentences = relationship("WordContextSentence", back_populates="word")
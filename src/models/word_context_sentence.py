@@ -11,7 +11,7 @@ class WordContextSentence(Base):
     __tablename__ = "word_context_sentences"
 
     id = Column(Integer, primary_key=True, index=True)
-    word_id = Column(Integer, ForeignKey("words.id", ondelete="CASCADE"))
+    word_id = Column(Integer, ForeignKey("words.id", ondelete="CASCADE"), index=True)
     japanese = Column(String)
     english = Column(String)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
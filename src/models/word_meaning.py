@@ -11,7 +11,7 @@ class WordMeaning(Base):
     __tablename__ = "word_meanings"
 
     id = Column(Integer, primary_key=True, index=True)
-    word_id = Column(Integer, ForeignKey("words.id", ondelete="CASCADE"))
+    word_id = Column(Integer, ForeignKey("words.id", ondelete="CASCADE"), index=True)
     meaning = Column(String)
     is_primary = Column(Boolean)
     explanation = Column(String)
@@ -11,7 +11,7 @@ class WordUsePattern(Base):
     __tablename__ = "word_use_patterns"
 
     id = Column(Integer, primary_key=True, index=True)
-    word_id = Column(Integer, ForeignKey("words.id", ondelete="CASCADE"))
+    word_id = Column(Integer, ForeignKey("words.id", ondelete="CASCADE"), index=True)
     pattern = Column(String)
     japanese = Column(String)
     english = Column(String)
@@ -1,9 +1,19 @@
-import aiohttp
-import requests
+import hashlib
+import json
 import logging
-from bs4 import BeautifulSoup
+
+from bs4 import BeautifulSoup, SoupStrainer
 
 from src.core import settings
+from src.crud import BulkLoader
+from src.crud.base import CrudBase
+from src.database import AsyncSessionLocal, SessionLocal
+from src.fetcher import Fetcher
+from src.models import CrawlState
+from src.parsers.frontier import CrawlFrontier
+from src.parsers.html_backend import make_section_strainer, make_soup
+from src.parsers.pipeline import Pipeline
+from src.parsers.spec import ExtractionSpec, Field
 
 
 class Mnemonic:
@@ -27,93 +37,100 @@ class Reading:
         self.is_primary = is_primary
 
 
-class BaseParser:
-    def __init__(self):
-        # Difficulty levels are used while parsing.
-        # For example, a radicals list page have the next url:
-        # https://wanikani.com/radicals?difficulty=pleasant
-        self.difficulty_levels = [
-            "pleasant",
-            "painful",
-            "death",
-            "hell",
-            "paradise",
-            "reality",
-        ]
-        self.request_headers = settings.request_headers
-
-        # Highlighting class names.
-        self.radical_highlight_class_name = "radical-highlight"
-        self.kanji_highlight_class_name = "kanji-highlight"
-        self.reading_highlight_class_name = "reading-highlight"
-        self.vocabulary_highlight_class_name = "vocabulary-highlight"
-
-    async def _get_page_soup(self, page_url: str) -> BeautifulSoup | None:
-        """
-        Getting a page html and loading into a BeautifulSoup object.
+# The fields, which are the same on the radical, kanji and vocabulary pages.
+LEVEL_FIELD = Field("a.page-header__icon--level")
+
+# One element can have multiple meanings: one primary meaning and some alternative meanings.
+MEANINGS_FIELD = Field(
+    "div.subject-section__meanings",
+    many=True,
+    fields={
+        "title": Field("h2.subject-section__meanings-title"),
+        "items": Field("p.subject-section__meanings-items"),
+    },
+)
+
+RADICAL_HIGHLIGHTS_FIELD = Field("span.radical-highlight", many=True)
+KANJI_HIGHLIGHTS_FIELD = Field("span.kanji-highlight", many=True)
+READING_HIGHLIGHTS_FIELD = Field("span.reading-highlight", many=True)
+VOCABULARY_HIGHLIGHTS_FIELD = Field("span.vocabulary-highlight", many=True)
+
+
+def mnemonic_field(section_class_name: str) -> Field:
+    """
+    Making the field of the mnemonic section.
+    All mnemonics use the same classes for mnemonic text and hint,
+    but kanji, for example, have two mnemonics: one for reading and one for meaning,
+    so the mnemonic is looked up only in its section.
+
+    Parameters:
+        section_class_name: str - the class name of the mnemonic section
+    """
+    return Field(
+        f"section.{section_class_name}",
+        fields={
+            "texts": Field("p.subject-section__text", many=True),
+            "hint": Field("p.subject-hint__text"),
+        },
+    )
+
+
+class BaseExtractor:
+    """
+    Extracting the element data from its page html.
+    Extractors don't do any IO and return plain picklable records,
+    so they can run in the parse worker processes.
+
+    The page fields are described by the extraction spec,
+    which is matched in one traversal of the page.
+
+    Only the page header and the sections from parsed_sections are loaded into the tree,
+    all the sections are loaded if parsed_sections is None.
+    """
+
+    spec: ExtractionSpec
+    parsed_sections: tuple[str, ...] | None = None
 
-        Parameters:
-            page_url: str - the url of the page to load
-        """
-        async with aiohttp.ClientSession(headers=self.request_headers) as session:
-            async with session.get(page_url) as resp:
-                
-                if resp.status != 200:
-                    logging.critical(f"Response code for {page_url} is {resp.status}!!!")
-                    return None
-                
-                page_html = await resp.text()
-                soup = BeautifulSoup(page_html, features="html.parser")
-                return soup
+    def __init__(self):
+        self.parse_only: SoupStrainer | None = None
+        if settings.html_parse_sections_only:
+            self.parse_only = make_section_strainer(self.parsed_sections)
 
-    def _get_element_links(
-        self, soup: BeautifulSoup, element_class_name: str
-    ) -> list[str]:
+    def extract(self, page_url: str, page_html: str):
         """
-        Getting the all links from a page to a source page of a radical, kanji or word.
-        The function requires the class name of the elements to search.
-        The href parameter of the found elements will be returned.
+        Extracting the element record from the page html.
 
         Parameters:
-            soup: BeautifulSoup - the page soup
-            element_class_name : str - the class name of the element to find
+            page_url: str - the url of the page
+            page_html: str - the html of the page
 
         Returns:
-            element_urls: list[str] - the list of the urls to the pages of the radicals, kanji or words.
+            the element record
         """
-        element_urls = []
+        raise NotImplementedError
 
-        ol_elements = soup.find_all("a", class_=element_class_name)
-
-        for element_li in ol_elements:
-            element_page_url = element_li.get("href")
-            element_urls.append(element_page_url)
+    def _extract_fields(self, page_html: str) -> dict:
+        """Matching the extraction spec against the page html."""
+        return self.spec.extract(make_soup(page_html, self.parse_only))
 
-        return element_urls
-
-    def _get_element_meanings(self, soup: BeautifulSoup) -> list[Meaning]:
+    def _get_element_meanings(self, meaning_blocks: list[dict]) -> list[Meaning]:
         """
         Get the element meanings.
         Element is understood as kanji or word,
         since kanji and word pages have the same layout for meaning blocks.
-        One element can have multiple meanings: one primary meaning and some alternative meanings.
         For example, https://www.wanikani.com/vocabulary/%E4%B8%8A.
 
         Parameters:
-            soup: BeautifulSoup - BeautifulSoup object.
+            meaning_blocks: list[dict] - the values of the meanings field.
 
         Returns:
             list[Meaning] - list of the meanings.
         """
         meanings = []
 
-        for div_meaning in soup.find_all("div", class_="subject-section__meanings"):
-            meaning_type = div_meaning.find(
-                "h2", class_="subject-section__meanings-title"
-            ).text
-            meaning_text = div_meaning.find(
-                "p", class_="subject-section__meanings-items"
-            ).text
+        for meaning_block in meaning_blocks:
+            meaning_type = meaning_block["title"]
+            meaning_text = meaning_block["items"]
 
             if meaning_type == "Primary":
                 meanings.append(Meaning(meaning=meaning_text, is_primary=True))
@@ -124,122 +141,252 @@ class BaseParser:
 
         return meanings
 
-    def _get_highlighted_words(
-        self, soup: BeautifulSoup, tag_name: str, class_name: str
-    ) -> list[str]:
+    def _get_mnemonic(self, mnemonic_section: dict | None) -> Mnemonic:
         """
-        Getting all the highlighted words from a soup.
+        Getting the mnemonic of kanji, radicals or word.
+        Mnemonic can have note, so function returns Mnemonic object,
+        which contains the note too.
 
-        Args:
-            soup: BeautifulSoup - the soup
-            class_name: str - the class name of the div
+        Parameters:
+            mnemonic_section: dict | None - the value of the mnemonic field.
 
         Returns:
-            list[str] - the list of highlighted words
+            Mnemonic: Mnemonic class object.
         """
-        highlighted_words = []
+        if mnemonic_section is None:
+            return Mnemonic(mnemonic="", hint="")
 
-        for element in soup.find_all(tag_name, class_=class_name):
-            highlighted_words.append(element.text)
+        return Mnemonic(
+            mnemonic="".join(mnemonic_section["texts"]),
+            hint=mnemonic_section["hint"] or "",
+        )
 
-        return highlighted_words
 
-    def _get_highlighted_radicals(self, soup: BeautifulSoup) -> list[str]:
+class BaseParser:
+    """
+    Crawling the elements of one type.
+    The list pages are loaded by the parser itself,
+    and the element pages go through the fetch -> parse -> store pipeline.
+    Subclasses define the extractor class, the crud object of the elements and the hooks,
+    which are called by the pipeline: prepare_record runs on the event loop,
+    store_records runs in the writer thread or store_records_async with the async engine.
+    """
+
+    extractor_class = BaseExtractor
+    crud: CrudBase
+
+    def __init__(self, entity_type: str, fetcher: Fetcher | None = None):
+        # Difficulty levels are used while parsing.
+        # For example, a radicals list page have the next url:
+        # https://wanikani.com/radicals?difficulty=pleasant
+        self.difficulty_levels = [
+            "pleasant",
+            "painful",
+            "death",
+            "hell",
+            "paradise",
+            "reality",
+        ]
+
+        # The fetcher is shared between the parsers,
+        # so all of them use the same connection pool.
+        self.fetcher = fetcher or Fetcher()
+
+        # Frontiers of the element pages and of the list pages.
+        # They are checkpointed into the database, so the crawl can be resumed.
+        self.frontier = CrawlFrontier(entity_type)
+        self.list_frontier = CrawlFrontier(f"{entity_type}_list")
+
+    async def run(self) -> None:
         """
-        Getting the highlighted radicals from the soup.
+        Run the parser.
+        Only the elements which are not stored yet according to the frontier are parsed,
+        with the refresh mode all the elements are parsed again.
+        The list pages are loaded again on every run, so the new elements are found.
         """
-        return self._get_highlighted_words(
-            soup, "span", self.radical_highlight_class_name
-        )
+        self.frontier.load()
+        self.list_frontier.load()
+        self.list_frontier.restart_stored()
 
-    def _get_highlighted_kanji(self, soup: BeautifulSoup) -> list[str]:
+        if settings.crawl_refresh:
+            self.frontier.restart_stored()
+
+        # The stored urls are loaded once, and the new links are checked in memory.
+        stored_urls = await self._get_stored_urls()
+
+        try:
+            for difficulty_level in self.difficulty_levels:
+                page_urls = await self._discover_page_urls(
+                    self._get_list_page_url(difficulty_level), self.page_link_class
+                )
+
+                for page_url in page_urls:
+                    if page_url in stored_urls and not settings.crawl_refresh:
+                        logging.warning(f"{page_url} already exists in the database.")
+                        self.frontier.set_state(page_url, CrawlState.STORED)
+
+            await Pipeline(self).run(self.frontier.get_unfinished_urls())
+        finally:
+            self.frontier.flush()
+
+    async def prepare_record(self, record):
         """
-        Getting the highlighted kanji from the soup.
+        Preparing the extracted record for storing on the event loop,
+        for example, downloading the media files.
         """
-        return self._get_highlighted_words(
-            soup, "span", self.kanji_highlight_class_name
-        )
+        return record
 
-    def _get_highlighted_vocabulary(self, soup: BeautifulSoup) -> list[str]:
+    def store_records(self, records: list) -> None:
         """
-        Get the highlighted vocabulary from the soup.
+        Storing the batch of the records into the database in one transaction.
+        With the refresh mode the elements are upserted by the url,
+        with the bulk load mode they are loaded by the bulk loader.
         """
-        return self._get_highlighted_words(
-            soup, "span", self.vocabulary_highlight_class_name
-        )
-
-    def _get_highlighted_readings(self, soup: BeautifulSoup) -> list[str]:
+        db_objs = self._create_objects(records)
+
+        with SessionLocal() as db:
+            if settings.crawl_refresh:
+                self.crud.upsert_many_with_children(db, db_objs)
+            elif settings.database_bulk_load:
+                BulkLoader(self.crud.Model).load(db, db_objs)
+            else:
+                self.crud.create_many_with_children(db, db_objs)
+
+    async def store_records_async(self, records: list) -> None:
+        """Storing the batch of the records like store_records with the async engine."""
+        db_objs = self._create_objects(records)
+
+        async with AsyncSessionLocal() as db:
+            if settings.crawl_refresh:
+                await db.run_sync(self.crud.upsert_many_with_children, db_objs)
+            elif settings.database_bulk_load:
+                await db.run_sync(BulkLoader(self.crud.Model).load, db_objs)
+            else:
+                await self.crud.create_many_with_children_async(db, db_objs)
+
+    def _create_objects(self, records: list) -> list:
+        """Making the model objects from the records with their content hashes."""
+        db_objs = []
+
+        for record in records:
+            db_obj = self._create_object(record)
+            db_obj.content_hash = self._get_content_hash(record)
+            db_objs.append(db_obj)
+
+        return db_objs
+
+    def _create_object(self, record):
+        """Making the model object with its children from the record."""
+        raise NotImplementedError
+
+    def _get_content_hash(self, record) -> str:
+        """Getting the hash of all the record data."""
+        content = json.dumps(record, default=vars, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def _get_list_page_url(self, difficulty_level: str) -> str:
+        """Getting the url of the list page with the difficulty level."""
+        raise NotImplementedError
+
+    async def _get_stored_urls(self) -> set[str]:
+        """Getting the urls of all the elements in the database."""
+        if settings.database_async:
+            async with AsyncSessionLocal() as db:
+                return await self.crud.get_urls_async(db)
+
+        with SessionLocal() as db:
+            return self.crud.get_urls(db)
+
+    async def _get_page_soup(
+        self, page_url: str, parse_only: SoupStrainer | None = None
+    ) -> BeautifulSoup | None:
         """
-        Getting the highlighted readings from the soup.
+        Getting a page html and loading into a BeautifulSoup object.
+
+        Parameters:
+            page_url: str - the url of the page to load
+            parse_only: SoupStrainer | None - the strainer of the tags to load
         """
-        return self._get_highlighted_words(
-            soup, "span", self.reading_highlight_class_name
+        page_html = await self.fetcher.get_text(
+            page_url, revalidate=settings.crawl_refresh
         )
 
-    def _get_element_level(self, soup: BeautifulSoup) -> int:
-        """
-        Getting the radical, kanji or word level from the soup.
-        """
-        return soup.find(
-            "a", class_="page-header__icon page-header__icon--level"
-        ).text.strip()
+        if page_html is None:
+            return None
 
-    def _get_mnemonic(self, soup, mnemonic_section_class: str) -> Mnemonic:
+        soup = make_soup(page_html, parse_only)
+        return soup
+
+    async def _discover_page_urls(
+        self, list_page_url: str, element_class_name: str
+    ) -> list[str]:
         """
-        Getting the mnemonic of kanji, radicals or word from the soup.
-        All mnemonics use the same classes for mnemonic text and hint,
-        but some mnemonics can have not only one mnemonic on page,
-        kanji, for example, have two mnemonics: one for reading and one for meaning.
-        If page can have multiple mnemonics, then it's needed to pass the part of the page,
-        where is only one mnemonic. Also, mnemonic can have note, so function returns Mnemonic object,
-        which contains the note too.
+        Getting the element page urls from the list page and adding them into the frontier.
+
+        Parameters:
+            list_page_url: str - the url of the list page
+            element_class_name: str - the class name of the element links
 
         Returns:
-            Mnemonic: Mnemonic class object.
+            list[str] - the element page urls, which are new for the frontier.
         """
-        mnemonic_section = soup.find("section", class_=mnemonic_section_class)
+        # Only the links are needed from the list page.
+        soup = await self._get_page_soup(list_page_url, SoupStrainer("a"))
 
-        mnemonic = ""
+        if soup is None:
+            logging.critical(f"Skipping {list_page_url}, the page can't be loaded.")
+            return []
 
-        for mnemonic_p in mnemonic_section.find_all(
-            "p", class_="subject-section__text"
-        ):
-            mnemonic += mnemonic_p.text
+        new_page_urls = []
 
-        hint = mnemonic_section.find("p", class_="subject-hint__text")
+        for page_url in self._get_element_links(soup, element_class_name):
+            if self.frontier.get_state(page_url) is None:
+                new_page_urls.append(page_url)
+                self.frontier.discover(page_url)
 
-        if hint:
-            hint = hint.text
-        else:
-            hint = ""
+        # The links are checkpointed before the list page is marked as processed.
+        self.frontier.flush()
+        self.list_frontier.set_state(list_page_url, CrawlState.STORED)
+        self.list_frontier.flush()
 
-        return Mnemonic(mnemonic=mnemonic, hint=hint)
+        return new_page_urls
 
-    def _highlight_text(self, text: str, word_to_highlight: str) -> str:
+    def _get_element_links(
+        self, soup: BeautifulSoup, element_class_name: str
+    ) -> list[str]:
         """
-        Highlights the word to highlight in the text.
+        Getting the all links from a page to a source page of a radical, kanji or word.
+        The function requires the class name of the elements to search.
+        The href parameter of the found elements will be returned.
 
         Parameters:
-            text: str - text
-            word_to_highlight: str - the word to highlight
+            soup: BeautifulSoup - the page soup
+            element_class_name : str - the class name of the element to find
 
         Returns:
-            highlighted_text: str - the highlighted text
+            element_urls: list[str] - the list of the urls to the pages of the radicals, kanji or words.
         """
-        highlighted_text = text.replace(word_to_highlight, word_to_highlight.upper())
-        return highlighted_text
+        element_urls = []
+
+        ol_elements = soup.find_all("a", class_=element_class_name)
+
+        for element_li in ol_elements:
+            element_page_url = element_li.get("href")
+            element_urls.append(element_page_url)
+
+        return element_urls
 
-    def _download_file(self, file_path_to_save: str, file_url: str) -> None:
+    async def _download_file(self, file_path_to_save: str, file_url: str) -> bool:
         """
         Downloads the file from the provided url.
         File will be saved in the file_path_to_save.
+        The file is streamed to disk by the shared media downloader.
 
         Parameters:
             file_path_to_save: str - file path to save.
             file_url: str - file url to download from.
 
         Returns:
-            None
+            bool - True, if the file is downloaded completely.
         """
-        with open(file_path_to_save, "wb") as audio_file:
-            audio_file.write(requests.get(file_url).content)
+        return await self.fetcher.media_downloader.download(file_url, file_path_to_save)
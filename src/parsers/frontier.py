@@ -0,0 +1,224 @@
+"""
+Durable crawl frontier, which allows to resume the crawl after a restart.
+"""
+
+import asyncio
+import logging
+
+from src.core import settings
+from src.crud import CrudCrawlUrl
+from src.database import SessionLocal
+from src.models import CrawlState, CrawlUrl
+
+
+class FrontierEntry:
+    def __init__(
+        self,
+        url: str,
+        state: str,
+        attempts: int = 0,
+        last_error: str | None = None,
+        obj_id: int | None = None,
+    ) -> None:
+        self.url = url
+        self.state = state
+        self.attempts = attempts
+        self.last_error = last_error
+        self.id = obj_id
+
+
+class CrawlFrontier:
+    """
+    Crawl frontier of one entity type.
+    It keeps the state and the number of attempts of every url in memory
+    and checkpoints the changed urls into the crawl_frontier table
+    every crawl_checkpoint_size changes and on flush().
+    If auto_flush is off, the checkpoints are made by the owner with flush_async(),
+    for example, the pipeline writer makes them between the batches.
+
+    The url state goes through discovered -> fetched -> parsed -> stored,
+    or becomes failed if something went wrong.
+    Urls which are not stored yet and have attempts left are unfinished work.
+    """
+
+    def __init__(self, entity_type: str) -> None:
+        self.entity_type = entity_type
+        self.crud_crawl_url = CrudCrawlUrl(CrawlUrl)
+
+        self._entries: dict[str, FrontierEntry] = {}
+        # Dict is used as an ordered set.
+        self._changed_urls: dict[str, None] = {}
+        self.auto_flush = True
+
+    def load(self) -> None:
+        """Loading the frontier state from the database."""
+        with SessionLocal() as db:
+            crawl_urls = self.crud_crawl_url.get_by_entity_type(db, self.entity_type)
+
+            self._entries = {
+                crawl_url.url: FrontierEntry(
+                    url=crawl_url.url,
+                    state=crawl_url.state,
+                    attempts=crawl_url.attempts,
+                    last_error=crawl_url.last_error,
+                    obj_id=crawl_url.id,
+                )
+                for crawl_url in crawl_urls
+            }
+
+        self._changed_urls = {}
+
+    def get_state(self, url: str) -> str | None:
+        """Getting the url state or None, if the url is not discovered yet."""
+        entry = self._entries.get(url)
+        return entry.state if entry else None
+
+    def discover(self, url: str, state: str = CrawlState.DISCOVERED) -> None:
+        """Adding the url into the frontier, if it's not there yet."""
+        if url in self._entries:
+            return
+
+        self._entries[url] = FrontierEntry(url=url, state=state)
+        self._mark_changed(url)
+
+    def start_attempt(self, url: str) -> None:
+        """Counting one more attempt to process the url."""
+        self.discover(url)
+        self._entries[url].attempts += 1
+        self._mark_changed(url)
+
+    def set_state(self, url: str, state: str, error: str | None = None) -> None:
+        """
+        Setting the url state.
+
+        Parameters:
+            url: str - the url
+            state: str - one of the CrawlState values
+            error: str | None - the error description for the failed state
+        """
+        self.discover(url)
+        self._entries[url].state = state
+        self._entries[url].last_error = error
+        self._mark_changed(url)
+
+    def restart_stored(self) -> None:
+        """Making the stored urls unfinished again with all their attempts."""
+        for entry in self._entries.values():
+            if entry.state == CrawlState.STORED:
+                entry.state = CrawlState.DISCOVERED
+                entry.attempts = 0
+                self._mark_changed(entry.url)
+
+    def get_unfinished_urls(self) -> list[str]:
+        """Getting the urls which are not stored yet and have attempts left."""
+        return [
+            entry.url
+            for entry in self._entries.values()
+            if entry.state != CrawlState.STORED
+            and entry.attempts < settings.crawl_max_attempts
+        ]
+
+    def is_checkpoint_due(self) -> bool:
+        """Checking if there are enough changed urls for the checkpoint."""
+        return len(self._changed_urls) >= settings.crawl_checkpoint_size
+
+    def flush(self) -> None:
+        """Checkpointing all the changed urls into the database."""
+        checkpoint = self._take_checkpoint()
+        if checkpoint is None:
+            return
+
+        urls, new_rows, changed_rows = checkpoint
+
+        try:
+            inserted_ids = self._save_checkpoint(new_rows, changed_rows)
+        except Exception:
+            self._restore_changed(urls)
+            raise
+
+        self._apply_inserted_ids(inserted_ids)
+
+    async def flush_async(self) -> None:
+        """
+        Checkpointing all the changed urls like flush,
+        but the database is written in a thread, so the event loop isn't blocked.
+        The urls, which are changed meanwhile, go into the next checkpoint.
+        If the checkpoint fails, its urls are kept for the next one.
+        """
+        checkpoint = self._take_checkpoint()
+        if checkpoint is None:
+            return
+
+        urls, new_rows, changed_rows = checkpoint
+        save_task = asyncio.ensure_future(
+            asyncio.to_thread(self._save_checkpoint, new_rows, changed_rows)
+        )
+
+        try:
+            inserted_ids = await asyncio.shield(save_task)
+        except asyncio.CancelledError:
+            # The thread can't be stopped, so its result is still applied,
+            # otherwise the inserted urls would be inserted again by the next flush.
+            try:
+                self._apply_inserted_ids(await save_task)
+            except Exception:
+                self._restore_changed(urls)
+            raise
+        except Exception as e:
+            logging.warning(f"Can't checkpoint the {self.entity_type} frontier: {e!r}")
+            self._restore_changed(urls)
+            return
+
+        self._apply_inserted_ids(inserted_ids)
+
+    def _take_checkpoint(self) -> tuple[list[str], list[dict], list[dict]] | None:
+        """
+        Taking the rows of the changed urls, the urls are not changed after that.
+
+        Returns:
+            tuple | None - the urls, the new rows and the changed rows,
+            None if nothing is changed.
+        """
+        if not self._changed_urls:
+            return None
+
+        urls = list(self._changed_urls)
+        new_rows = []
+        changed_rows = []
+
+        for url in urls:
+            entry = self._entries[url]
+            row = {
+                "state": entry.state,
+                "attempts": entry.attempts,
+                "last_error": entry.last_error,
+            }
+
+            if entry.id is None:
+                new_rows.append({"url": url, "entity_type": self.entity_type, **row})
+            else:
+                changed_rows.append({"id": entry.id, **row})
+
+        self._changed_urls = {}
+        return urls, new_rows, changed_rows
+
+    def _save_checkpoint(
+        self, new_rows: list[dict], changed_rows: list[dict]
+    ) -> dict[str, int]:
+        """Writing the checkpoint rows, it doesn't touch the frontier state."""
+        with SessionLocal() as db:
+            return self.crud_crawl_url.save_states(db, new_rows, changed_rows)
+
+    def _apply_inserted_ids(self, inserted_ids: dict[str, int]) -> None:
+        for url, obj_id in inserted_ids.items():
+            self._entries[url].id = obj_id
+
+    def _restore_changed(self, urls: list[str]) -> None:
+        for url in urls:
+            self._changed_urls[url] = None
+
+    def _mark_changed(self, url: str) -> None:
+        self._changed_urls[url] = None
+
+        if self.auto_flush and self.is_checkpoint_due():
+            self.flush()
@@ -0,0 +1,40 @@
+"""
+Highlighting the words in the mnemonics with the upper case.
+"""
+
+import re
+from typing import Iterable
+
+
+class Highlighter:
+    """
+    Highlighting all the words of one page in one pass over the text.
+
+    The words are compiled into one alternation regex, the longest words go first,
+    so if the words overlap, the longest one is highlighted at the leftmost position.
+    The result doesn't depend on the order of the words.
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        unique_words = sorted(
+            {word for word in words if word}, key=lambda word: (-len(word), word)
+        )
+
+        self.pattern: re.Pattern | None = None
+        if unique_words:
+            self.pattern = re.compile("|".join(map(re.escape, unique_words)))
+
+    def highlight(self, text: str) -> str:
+        """
+        Highlights the words in the text.
+
+        Parameters:
+            text: str - text
+
+        Returns:
+            highlighted_text: str - the highlighted text
+        """
+        if self.pattern is None or not text:
+            return text
+
+        return self.pattern.sub(lambda match: match.group().upper(), text)
@@ -0,0 +1,73 @@
+"""
+Loading the page html into BeautifulSoup with the configured tree builder.
+"""
+
+import logging
+from functools import cache
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+
+from src.core import settings
+
+# The class of the page header, which contains the element symbol and level.
+PAGE_HEADER_CLASS = "page-header"
+
+
+@cache
+def get_html_backend() -> str:
+    """
+    Getting the tree builder from the settings.
+    If the builder library is not installed, the builtin html.parser is used.
+    """
+    if builder_registry.lookup(settings.html_parser_backend) is None:
+        logging.warning(
+            f"HTML parser backend {settings.html_parser_backend} is not installed, "
+            "using html.parser."
+        )
+        return "html.parser"
+
+    return settings.html_parser_backend
+
+
+def make_soup(page_html: str, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+    """
+    Loading the page html into a BeautifulSoup object.
+
+    Parameters:
+        page_html: str - the html of the page
+        parse_only: SoupStrainer | None - the strainer of the top level tags to keep
+    """
+    return BeautifulSoup(page_html, features=get_html_backend(), parse_only=parse_only)
+
+
+def make_section_strainer(section_names: tuple[str, ...] | None) -> SoupStrainer:
+    """
+    Making the strainer, which keeps only the page header and the page sections.
+    The tags outside of them are not added into the tree at all.
+
+    Parameters:
+        section_names: tuple[str, ...] | None - the ids or the classes of the sections to keep,
+            all the sections are kept if None.
+    """
+
+    def is_parsed_tag(name: str, attrs: dict) -> bool:
+        # Depending on the builder the class attribute is a string or a list.
+        classes = attrs.get("class") or []
+        if isinstance(classes, str):
+            classes = classes.split()
+
+        if PAGE_HEADER_CLASS in classes:
+            return True
+
+        if name != "section":
+            return False
+
+        if section_names is None:
+            return True
+
+        return attrs.get("id") in section_names or any(
+            class_name in section_names for class_name in classes
+        )
+
+    return SoupStrainer(is_parsed_tag)
@@ -1,207 +1,169 @@
-import asyncio
-import logging
-
 from src.core import settings
-from src.crud import (
-    CrudKanji,
-    CrudKanjiMeaning,
-    CrudKanjiRadical,
-    CrudKanjiReading,
-    CrudWKRadical,
-)
-from src.database import SessionLocal
-from src.models import Kanji, KanjiMeaning, KanjiRadical, KanjiReading, WKRadical
+from src.crud import CrudKanji
+from src.fetcher import Fetcher
+from src.models import Kanji, KanjiMeaning, KanjiRadical, KanjiReading
 from src.parsers import WKRadicalsParser
-from src.parsers.base import BaseParser, Meaning, Mnemonic, Reading
-
-
-class KanjiParser(BaseParser):
-    def __init__(self):
-        super().__init__()
-
-        # The class name of the "a" tag which has link to the radical page.
-        self.kanji_page_link_class = "subject-character subject-character--kanji subject-character--grid subject-character--unlocked"
-
-        self.crud_kanji = CrudKanji(Kanji)
-        self.crud_kanji_meaning = CrudKanjiMeaning(KanjiMeaning)
-        self.crud_kanji_reading = CrudKanjiReading(KanjiReading)
-        self.crud_kanji_radical = CrudKanjiRadical(KanjiRadical)
-        self.crud_wk_radical = CrudWKRadical(WKRadical)
-
-    async def run(self) -> None:
-        """
-        Run the parser.
-        """
-        tasks = []
-
-        for difficulty_level in self.difficulty_levels:
-            kanji_list_page_url = (
-                f"{settings.WANIKANI_BASE_URL}/kanji?difficulty={difficulty_level}"
-            )
-            soup = self._get_page_soup(kanji_list_page_url)
-            kanji_page_urls = self._get_element_links(soup, self.kanji_page_link_class)
-            total_kanji_count = len(kanji_page_urls)
-
-            for i, kanji_page_url in enumerate(kanji_page_urls):
-                if not self._is_kanji_exists(kanji_page_url):
-                    tasks.append(
-                        asyncio.create_task(
-                            self._parse_kanji_page(
-                                kanji_page_url, i + 1, total_kanji_count
-                            )
-                        )
-                    )
-                else:
-                    logging.warning(f"{kanji_page_url} already exists in the database.")
-
-        await asyncio.gather(*tasks)
-
-    def _is_kanji_exists(self, url: str) -> bool:
-        """Checking if a kanji exists in the database by url."""
-        with SessionLocal() as db:
-            return self.crud_kanji.is_kanji_by_url(db, url)
-
-    async def _parse_kanji_page(
-        self, kanji_page_url: str, i: int, total_kanji_count: int
-    ) -> Kanji:
+from src.parsers.base import (
+    KANJI_HIGHLIGHTS_FIELD,
+    LEVEL_FIELD,
+    MEANINGS_FIELD,
+    RADICAL_HIGHLIGHTS_FIELD,
+    READING_HIGHLIGHTS_FIELD,
+    BaseExtractor,
+    BaseParser,
+    Meaning,
+    Mnemonic,
+    Reading,
+    mnemonic_field,
+)
+from src.parsers.highlight import Highlighter
+from src.parsers.radical_resolver import RadicalResolver
+from src.parsers.spec import ExtractionSpec, Field
+
+
+class KanjiRecord:
+    """
+    The kanji data extracted from its page.
+    The radical urls are the links from the components section, None if there is no link.
+    The radical ids are resolved by the parser before the kanji is stored.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        level: int,
+        symbol: str,
+        radical_meanings: list[str],
+        radical_urls: list[str | None],
+        meanings: list[Meaning],
+        meaning_mnemonic: Mnemonic,
+        readings: list[Reading],
+        reading_mnemonic: Mnemonic,
+    ) -> None:
+        self.url = url
+        self.level = level
+        self.symbol = symbol
+        self.radical_meanings = radical_meanings
+        self.radical_urls = radical_urls
+        self.radical_ids: list[int] = []
+        self.meanings = meanings
+        self.meaning_mnemonic = meaning_mnemonic
+        self.readings = readings
+        self.reading_mnemonic = reading_mnemonic
+
+
+class KanjiExtractor(BaseExtractor):
+    parsed_sections = (
+        "section-components",
+        "subject-section--meaning",
+        "subject-section--reading",
+    )
+
+    spec = ExtractionSpec(
+        {
+            "level": LEVEL_FIELD,
+            "symbol": Field("span.page-header__icon--kanji"),
+            "radical_meanings": Field(
+                "section#section-components span.subject-character__meaning",
+                many=True,
+            ),
+            "radical_links": Field(
+                "section#section-components a",
+                many=True,
+                attr="href",
+                fields={"meaning": Field("span.subject-character__meaning")},
+            ),
+            "meanings": MEANINGS_FIELD,
+            "meaning_mnemonic": mnemonic_field("subject-section--meaning"),
+            # One kanji can have multiple readings of three types: on-yomi, kun-yomi, nanori.
+            # The primary reading type has specific class.
+            "readings": Field(
+                "div.subject-readings__reading",
+                many=True,
+                attr="class",
+                fields={
+                    "title": Field("h3.subject-readings__reading-title"),
+                    "items": Field("p.subject-readings__reading-items"),
+                },
+            ),
+            "reading_mnemonic": mnemonic_field("subject-section--reading"),
+            "highlighted_radicals": RADICAL_HIGHLIGHTS_FIELD,
+            "highlighted_kanji": KANJI_HIGHLIGHTS_FIELD,
+            "highlighted_readings": READING_HIGHLIGHTS_FIELD,
+        }
+    )
+
+    def extract(self, page_url: str, page_html: str) -> KanjiRecord:
         """
         Parsing the kanji info from page.
 
         Parameters:
-            kanji_page_url: str - page of the kanji to parse
+            page_url: str - page of the kanji to parse
+            page_html: str - html of the page
 
         Returns:
-            WaniKaniRadical object
+            KanjiRecord object
         """
-        soup = await self._get_page_soup(kanji_page_url)
-
-        if soup == None:
-            return None
-
-        level = self._get_element_level(soup)
-        symbol = soup.find(
-            "span", class_="page-header__icon page-header__icon--kanji"
-        ).text.strip()
-
-        radical_ids: list[int] = self._get_kanji_radicals(
-            soup.find("section", {"id": "section-components"})
+        fields = self._extract_fields(page_html)
+
+        radical_urls_by_meaning = {
+            link["meaning"]: link["href"]
+            for link in fields["radical_links"]
+            if link["meaning"] is not None
+        }
+
+        meaning_mnemonic = self._get_mnemonic(fields["meaning_mnemonic"])
+        reading_mnemonic = self._get_mnemonic(fields["reading_mnemonic"])
+
+        # Highlighting radicals, kanji and readings in mnemonics with the upper case.
+        highlighter = Highlighter(
+            fields["highlighted_radicals"]
+            + fields["highlighted_kanji"]
+            + fields["highlighted_readings"]
         )
 
-        meanings: list[Meaning] = self._get_element_meanings(soup)
-        meaning_mnemonic = self._get_mnemonic(
-            soup, "subject-section subject-section--meaning"
+        for mnemonic in (meaning_mnemonic, reading_mnemonic):
+            mnemonic.mnemonic = highlighter.highlight(mnemonic.mnemonic)
+            mnemonic.hint = highlighter.highlight(mnemonic.hint)
+
+        return KanjiRecord(
+            url=page_url,
+            level=fields["level"].strip(),
+            symbol=fields["symbol"].strip(),
+            radical_meanings=fields["radical_meanings"],
+            radical_urls=[
+                radical_urls_by_meaning.get(meaning)
+                for meaning in fields["radical_meanings"]
+            ],
+            meanings=self._get_element_meanings(fields["meanings"]),
+            meaning_mnemonic=meaning_mnemonic,
+            readings=self._get_kanji_readings(fields["readings"]),
+            reading_mnemonic=reading_mnemonic,
         )
 
-        readings: list[Reading] = self._get_kanji_readings(soup)
-        reading_mnemonic = self._get_mnemonic(
-            soup, "subject-section subject-section--reading"
-        )
-
-        # Highlighting radical meaning in mnemonic with the upper case.
-        highlighted_radicals = self._get_highlighted_radicals(soup)
-        highlighted_kanji = self._get_highlighted_kanji(soup)
-        highlighted_readings = self._get_highlighted_readings(soup)
-
-        for highlighted_word in (
-            highlighted_radicals + highlighted_kanji + highlighted_readings
-        ):
-            meaning_mnemonic.mnemonic = self._highlight_text(
-                meaning_mnemonic.mnemonic, highlighted_word
-            )
-            meaning_mnemonic.hint = self._highlight_text(
-                meaning_mnemonic.hint, highlighted_word
-            )
-
-            reading_mnemonic.mnemonic = self._highlight_text(
-                reading_mnemonic.mnemonic, highlighted_word
-            )
-            reading_mnemonic.hint = self._highlight_text(
-                reading_mnemonic.hint, highlighted_word
-            )
-
-        with SessionLocal() as db:
-            kanji = Kanji(level=level, symbol=symbol, url=kanji_page_url)
-            kanji = self.crud_kanji.create(db, kanji)
-
-            meanings_bulk_insert = self._create_meaning_bulk(
-                kanji, meanings, meaning_mnemonic
-            )
-            self.crud_kanji_meaning.create_many(db, meanings_bulk_insert)
-
-            readings_bulk_insert = self._create_reading_bulk(
-                kanji, readings, reading_mnemonic
-            )
-            self.crud_kanji_reading.create_many(db, readings_bulk_insert)
-
-            radicals_bulk_insert = self._create_radical_bulk(kanji, radical_ids)
-            self.crud_kanji_radical.create_many(db, radicals_bulk_insert)
-
-        logging.info(f"Processed {kanji_page_url} [{i}/{total_kanji_count}]")
-
-    def _get_kanji_radicals(self, soup) -> list[int]:
-        """
-        Getting kanji radicals.
-        Returning kanji radicals ids.
-        """
-        kanji_radical_ids = []
-        for kanji_radical_span in soup.find_all(
-            "span", class_="subject-character__meaning"
-        ):
-            kanji_radical_meaning = kanji_radical_span.text
-
-            with SessionLocal() as db:
-                is_wk_radical = self.crud_wk_radical.is_radical_by_meaning(
-                    db, kanji_radical_meaning
-                )
-
-                if not is_wk_radical:
-                    logging.critical(
-                        f"Radical {kanji_radical_meaning} doesn't exist in database"
-                    )
-                    logging.info(f"Running wk_radicals parser")
-                    wk_radical_parser = WKRadicalsParser()
-                    wk_radical_parser.run(is_download_image=True)
-
-                wk_radical = self.crud_wk_radical.get_by_meaning(
-                    db, kanji_radical_meaning
-                )
-                kanji_radical_ids.append(wk_radical.id)
-
-        return kanji_radical_ids
-
-    def _get_kanji_readings(self, soup) -> list[Reading]:
+    def _get_kanji_readings(self, reading_blocks: list[dict]) -> list[Reading]:
         """
         Getting kanji readings.
-        One kanji can have multiple readings of three types: on-yomi, kun-yomi, nanori.
         There is one primary reading and some alternative readings.
         For example, https://www.wanikani.com/kanji/%E5%A7%94.
 
         Parameters:
-            soup: BeautifulSoup - BeautifulSoup object.
+            reading_blocks: list[dict] - the values of the readings field.
 
         Returns:
             list[Reading] - list of the readings.
         """
         readings = []
 
-        for reading_type_div in soup.find_all(
-            "div", class_="subject-readings__reading"
-        ):
-            reading_type = reading_type_div.find(
-                "h3", class_="subject-readings__reading-title"
-            ).text.strip()
-            reading_text = reading_type_div.find(
-                "p", class_="subject-readings__reading-items"
-            ).text.strip()
-            is_primary = "subject-readings__reading--primary" in reading_type_div.get(
-                "class"
-            )
+        for reading_block in reading_blocks:
+            reading_type = reading_block["title"].strip()
+            reading_text = reading_block["items"].strip()
+            is_primary = "subject-readings__reading--primary" in reading_block["class"]
 
             if reading_text == "None":
                 continue
 
             for reading in reading_text.split(", "):
-                # Reading type is primary reading type if it has specific class.
                 readings.append(
                     Reading(
                         reading=reading.strip(),
@@ -212,8 +174,55 @@ class KanjiParser(BaseParser):
 
         return readings
 
+
+class KanjiParser(BaseParser):
+    extractor_class = KanjiExtractor
+
+    def __init__(self, fetcher: Fetcher | None = None):
+        super().__init__("kanji", fetcher)
+
+        # The class name of the "a" tag which has link to the radical page.
+        self.page_link_class = "subject-character subject-character--kanji subject-character--grid subject-character--unlocked"
+
+        self.crud = CrudKanji(Kanji)
+
+        # The missing radicals are loaded by the radicals parser with the same fetcher.
+        self.radical_resolver = RadicalResolver(
+            WKRadicalsParser(is_download_image=True, fetcher=self.fetcher)
+        )
+
+    async def run(self) -> None:
+        # The radicals could be stored since the last run, so their ids are loaded again.
+        self.radical_resolver.clear()
+        await super().run()
+
+    def _get_list_page_url(self, difficulty_level: str) -> str:
+        return f"{settings.WANIKANI_BASE_URL}/kanji?difficulty={difficulty_level}"
+
+    async def prepare_record(self, record: KanjiRecord) -> KanjiRecord:
+        """Resolving the kanji radicals into the radical ids."""
+        record.radical_ids = [
+            await self.radical_resolver.resolve(meaning, url)
+            for meaning, url in zip(record.radical_meanings, record.radical_urls)
+        ]
+        return record
+
+    def _create_object(self, record: KanjiRecord) -> Kanji:
+        return Kanji(
+            level=record.level,
+            symbol=record.symbol,
+            url=record.url,
+            meanings=self._create_meaning_bulk(
+                record.meanings, record.meaning_mnemonic
+            ),
+            readings=self._create_reading_bulk(
+                record.readings, record.reading_mnemonic
+            ),
+            radicals=self._create_radical_bulk(record.radical_ids),
+        )
+
     def _create_meaning_bulk(
-        self, kanji: Kanji, meanings: list[Meaning], meaning_mnemonic: Mnemonic
+        self, meanings: list[Meaning], meaning_mnemonic: Mnemonic
     ) -> list[KanjiMeaning]:
         meaning_bulk = []
 
@@ -222,7 +231,6 @@ class KanjiParser(BaseParser):
             if meaning.is_primary:
                 meaning_bulk.append(
                     KanjiMeaning(
-                        kanji_id=kanji.id,
                         meaning=meaning.meaning,
                         is_primary=meaning.is_primary,
                         mnemonic=meaning_mnemonic.mnemonic,
@@ -232,7 +240,6 @@ class KanjiParser(BaseParser):
             else:
                 meaning_bulk.append(
                     KanjiMeaning(
-                        kanji_id=kanji.id,
                         meaning=meaning.meaning,
                         is_primary=meaning.is_primary,
                     )
@@ -241,7 +248,7 @@ class KanjiParser(BaseParser):
         return meaning_bulk
 
     def _create_reading_bulk(
-        self, kanji: Kanji, readings: list[Reading], reading_mnemonic: Mnemonic
+        self, readings: list[Reading], reading_mnemonic: Mnemonic
     ) -> list[KanjiReading]:
         reading_bulk = []
 
@@ -250,7 +257,6 @@ class KanjiParser(BaseParser):
             if reading.is_primary:
                 reading_bulk.append(
                     KanjiReading(
-                        kanji_id=kanji.id,
                         reading=reading.reading,
                         type=reading.type,
                         is_primary=reading.is_primary,
@@ -261,7 +267,6 @@ class KanjiParser(BaseParser):
             else:
                 reading_bulk.append(
                     KanjiReading(
-                        kanji_id=kanji.id,
                         type=reading.type,
                         reading=reading.reading,
                         is_primary=reading.is_primary,
@@ -270,14 +275,12 @@ class KanjiParser(BaseParser):
 
         return reading_bulk
 
-    def _create_radical_bulk(
-        self, kanji: Kanji, radical_ids: list[int]
-    ) -> list[KanjiRadical]:
+    def _create_radical_bulk(self, radical_ids: list[int]) -> list[KanjiRadical]:
         radical_bulk = []
 
         for radical_id in radical_ids:
             radical_bulk.append(
-                KanjiRadical(kanji_id=kanji.id, wk_radical_id=radical_id)
+                KanjiRadical(wk_radical_id=radical_id)
             )
 
         return radical_bulk
@@ -0,0 +1,257 @@
+"""
+The fetch -> parse -> store pipeline for the element pages.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from src.core import settings
+from src.models import CrawlState
+
+if TYPE_CHECKING:
+    from src.parsers.base import BaseExtractor, BaseParser
+
+# The process pool is shared by all the parsers and created on the first use.
+_process_pool: ProcessPoolExecutor | None = None
+
+# Extractors cached in the worker process, one per extractor class.
+_extractors: dict[type, "BaseExtractor"] = {}
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Getting the shared pool of the parse worker processes."""
+    global _process_pool
+
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=settings.pipeline_parse_workers)
+
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stopping the parse worker processes."""
+    global _process_pool
+
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
+
+def extract_page(extractor_class: type, page_url: str, page_html: str):
+    """
+    Extracting the record from the page html.
+    The function is called in the parse worker process.
+    """
+    extractor = _extractors.get(extractor_class)
+
+    if extractor is None:
+        extractor = _extractors[extractor_class] = extractor_class()
+
+    return extractor.extract(page_url, page_html)
+
+
+class Pipeline:
+    """
+    Staged pipeline for the element pages, the stages are connected by bounded queues:
+    - fetchers load the page html through the shared fetcher;
+    - parse workers extract the records in the process pool
+      and prepare them with the parser prepare_record hook on the event loop;
+    - the single writer stores the batches of the records
+      with the parser store_records hook in a thread
+      or with the store_records_async hook, if the async engine is enabled.
+
+    Every stage has its own concurrency setting.
+    When the writer falls behind, the record queue fills up and slows down the parse workers,
+    and they slow down the fetchers in the same way.
+    An error on one page marks it as failed in the frontier and doesn't stop the other pages.
+    """
+
+    def __init__(self, parser: "BaseParser") -> None:
+        self.parser = parser
+        self.frontier = parser.frontier
+
+        self._total_page_count = 0
+        self._stored_page_count = 0
+
+    async def run(self, page_urls: list[str]) -> None:
+        """
+        Running all the pages through the pipeline.
+
+        Parameters:
+            page_urls: list[str] - the urls of the element pages
+        """
+        if not page_urls:
+            return
+
+        self._total_page_count = len(page_urls)
+        self._stored_page_count = 0
+
+        url_queue = asyncio.Queue()
+        html_queue = asyncio.Queue(maxsize=settings.pipeline_queue_size)
+        record_queue = asyncio.Queue(maxsize=settings.pipeline_queue_size)
+
+        for page_url in page_urls:
+            url_queue.put_nowait(page_url)
+
+        fetchers = [
+            asyncio.create_task(self._fetch_worker(url_queue, html_queue))
+            for _ in range(settings.pipeline_fetch_workers)
+        ]
+        parsers = [
+            asyncio.create_task(self._parse_worker(html_queue, record_queue))
+            for _ in range(settings.pipeline_parse_workers)
+        ]
+        writer = asyncio.create_task(self._store_worker(record_queue))
+
+        # The frontier is checkpointed by the writer in a thread,
+        # so the workers don't wait for the database on the event loop.
+        self.frontier.auto_flush = False
+
+        try:
+            await asyncio.gather(*fetchers)
+
+            # Every worker of the next stage stops on its own None.
+            for _ in parsers:
+                await html_queue.put(None)
+            await asyncio.gather(*parsers)
+
+            await record_queue.put(None)
+            await writer
+        finally:
+            for task in fetchers + parsers + [writer]:
+                task.cancel()
+
+            self.frontier.auto_flush = True
+
+    async def _fetch_worker(
+        self, url_queue: asyncio.Queue, html_queue: asyncio.Queue
+    ) -> None:
+        while not url_queue.empty():
+            page_url = url_queue.get_nowait()
+            self.frontier.start_attempt(page_url)
+
+            try:
+                # With the refresh mode the cached pages are revalidated,
+                # so the changed pages are loaded again.
+                page_html = await self.parser.fetcher.get_text(
+                    page_url, revalidate=settings.crawl_refresh
+                )
+            except Exception as e:
+                self._fail(page_url, e)
+                continue
+
+            if page_html is None:
+                self.frontier.set_state(
+                    page_url, CrawlState.FAILED, "The page can't be loaded."
+                )
+                continue
+
+            self.frontier.set_state(page_url, CrawlState.FETCHED)
+            await html_queue.put((page_url, page_html))
+
+    async def _parse_worker(
+        self, html_queue: asyncio.Queue, record_queue: asyncio.Queue
+    ) -> None:
+        loop = asyncio.get_running_loop()
+
+        while (item := await html_queue.get()) is not None:
+            page_url, page_html = item
+            logging.info(f"Processing {page_url}")
+
+            try:
+                record = await loop.run_in_executor(
+                    get_process_pool(),
+                    extract_page,
+                    self.parser.extractor_class,
+                    page_url,
+                    page_html,
+                )
+                record = await self.parser.prepare_record(record)
+            except Exception as e:
+                self._fail(page_url, e)
+                continue
+
+            self.frontier.set_state(page_url, CrawlState.PARSED)
+            await record_queue.put((page_url, record))
+
+    async def _store_worker(self, record_queue: asyncio.Queue) -> None:
+        is_done = False
+
+        while not is_done:
+            batch, is_done = await self._get_batch(record_queue)
+
+            if batch:
+                await self._store_batch(batch)
+
+            if self.frontier.is_checkpoint_due():
+                await self.frontier.flush_async()
+
+    async def _get_batch(self, record_queue: asyncio.Queue) -> tuple[list, bool]:
+        """
+        Getting the batch of the records from the queue.
+        The batch is collected until it has the batch size
+        or the batch timeout passes after the first record.
+
+        Returns:
+            tuple[list, bool] - the batch and whether the queue is done
+        """
+        item = await record_queue.get()
+
+        if item is None:
+            return [], True
+
+        batch = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.pipeline_store_batch_timeout
+
+        while len(batch) < settings.pipeline_store_batch_size:
+            timeout = deadline - loop.time()
+
+            if timeout <= 0:
+                break
+
+            try:
+                item = await asyncio.wait_for(record_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+
+            if item is None:
+                return batch, True
+
+            batch.append(item)
+
+        return batch, False
+
+    async def _store_batch(self, batch: list[tuple[str, object]]) -> None:
+        records = [record for _, record in batch]
+
+        try:
+            if settings.database_async:
+                await self.parser.store_records_async(records)
+            else:
+                await asyncio.to_thread(self.parser.store_records, records)
+        except Exception as e:
+            if len(batch) == 1:
+                self._fail(batch[0][0], e)
+                return
+
+            # The batch is stored in one transaction, so one bad record fails the whole batch.
+            # The records are stored one by one to store all the others.
+            logging.warning("Error while storing a batch, storing it record by record.")
+            for item in batch:
+                await self._store_batch([item])
+            return
+
+        for page_url, _ in batch:
+            self._stored_page_count += 1
+            self.frontier.set_state(page_url, CrawlState.STORED)
+            logging.info(
+                f"Processed {page_url} "
+                f"[{self._stored_page_count}/{self._total_page_count}]"
+            )
+
+    def _fail(self, page_url: str, error: Exception) -> None:
+        logging.error(f"Error while parsing {page_url}", exc_info=error)
+        self.frontier.set_state(page_url, CrawlState.FAILED, repr(error))
@@ -0,0 +1,113 @@
+"""
+Resolving the kanji radicals into the radical ids.
+"""
+
+import asyncio
+import logging
+
+from src.crud import CrudWKRadical
+from src.database import SessionLocal
+from src.models import WKRadical
+from src.parsers.pipeline import extract_page, get_process_pool
+from src.parsers.wk_radical import WKRadicalsParser
+
+
+class RadicalResolver:
+    """
+    Resolving the radicals by their urls or meanings from memory.
+
+    The ids of the stored radicals are loaded once.
+    If a radical is missing, only its page is loaded and stored by the radicals parser.
+    Concurrent lookups of the same missing radical share one load (single-flight).
+    """
+
+    def __init__(self, radicals_parser: WKRadicalsParser) -> None:
+        self.radicals_parser = radicals_parser
+        self.crud_wk_radical = CrudWKRadical(WKRadical)
+
+        self._ids_by_url: dict[str, int] = {}
+        self._ids_by_meaning: dict[str, int] = {}
+        self._is_loaded = False
+        self._load_lock = asyncio.Lock()
+
+        # The loads of the missing radicals by their urls.
+        self._pending: dict[str, asyncio.Task] = {}
+
+    def clear(self) -> None:
+        """Dropping the loaded ids, so they are loaded again on the next lookup."""
+        self._ids_by_url.clear()
+        self._ids_by_meaning.clear()
+        self._is_loaded = False
+
+    async def resolve(self, meaning: str, url: str | None) -> int:
+        """
+        Getting the radical id.
+
+        Parameters:
+            meaning: str - the radical meaning
+            url: str | None - the url of the radical page
+
+        Returns:
+            int - the radical id
+        """
+        await self._load()
+
+        radical_id = self._ids_by_url.get(url) or self._ids_by_meaning.get(meaning)
+
+        if radical_id is not None:
+            return radical_id
+
+        if url is None:
+            raise ValueError(f"Radical {meaning} doesn't exist and has no page url.")
+
+        logging.warning(f"Radical {meaning} doesn't exist in database, loading {url}")
+
+        task = self._pending.get(url)
+
+        if task is None:
+            task = self._pending[url] = asyncio.create_task(self._load_radical(url))
+            task.add_done_callback(lambda _: self._pending.pop(url, None))
+
+        # The shared load isn't cancelled, if one of the waiting kanji is cancelled.
+        return await asyncio.shield(task)
+
+    async def _load(self) -> None:
+        async with self._load_lock:
+            if self._is_loaded:
+                return
+
+            rows = await asyncio.to_thread(self._get_radical_keys)
+
+            for radical_id, meaning, url in rows:
+                self._remember(radical_id, meaning, url)
+
+            self._is_loaded = True
+
+    def _get_radical_keys(self) -> list[tuple[int, str, str]]:
+        with SessionLocal() as db:
+            return self.crud_wk_radical.get_ids_with_keys(db)
+
+    async def _load_radical(self, url: str) -> int:
+        """Loading, parsing and storing the radical page."""
+        page_html = await self.radicals_parser.fetcher.get_text(url)
+
+        if page_html is None:
+            raise ValueError(f"Radical page {url} can't be loaded.")
+
+        record = await asyncio.get_running_loop().run_in_executor(
+            get_process_pool(),
+            extract_page,
+            self.radicals_parser.extractor_class,
+            url,
+            page_html,
+        )
+        record = await self.radicals_parser.prepare_record(record)
+        radical_id = await asyncio.to_thread(self.radicals_parser.store_radical, record)
+
+        self._remember(radical_id, record.meaning, url)
+        return radical_id
+
+    def _remember(self, radical_id: int, meaning: str, url: str | None) -> None:
+        if url:
+            self._ids_by_url[url] = radical_id
+        self._ids_by_meaning.setdefault(meaning, radical_id)
@@ -0,0 +1,162 @@
+"""
+Declarative extraction specs for the element pages.
+The selectors are compiled once, and the whole spec is matched in one traversal of the page.
+"""
+
+import re
+
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+
+# The type selector of the last compound selector, for example "p" in "section p.text".
+_TAG_NAME_RE = re.compile(r"([a-zA-Z][\w-]*)?[^\s>+~]*$")
+
+
+class Field:
+    """
+    One field of the extraction spec.
+
+    The field value is the text of the matched tag or the value of its attribute.
+    If the field has the sub-fields, it's a group: its value is a dict of the sub-field values,
+    which are matched only inside the group tag.
+    The attribute value of the group tag is stored in the dict under the attribute name.
+    Only the first match is kept if the field is not many, otherwise the list of all the matches.
+    """
+
+    def __init__(
+        self,
+        selector: str,
+        many: bool = False,
+        attr: str | None = None,
+        fields: dict[str, "Field"] | None = None,
+    ) -> None:
+        self.selector = selector
+        self.many = many
+        self.attr = attr
+        self.fields = fields or {}
+        self.pattern = soupsieve.compile(selector)
+        self.tag_name = self._get_tag_name(selector)
+
+    def empty(self) -> list | None:
+        """Getting the field value, when nothing is matched."""
+        return [] if self.many else None
+
+    def get_value(self, tag: Tag) -> str | list | dict | None:
+        """Getting the value of the matched tag."""
+        if self.fields:
+            item = {name: field.empty() for name, field in self.fields.items()}
+            if self.attr:
+                item[self.attr] = tag.get(self.attr)
+            return item
+
+        if self.attr:
+            return tag.get(self.attr)
+
+        return tag.text
+
+    @staticmethod
+    def _get_tag_name(selector: str) -> str | None:
+        """
+        Getting the tag name, which the selector can match.
+        None means the selector can match any tag.
+        """
+        if any(symbol in selector for symbol in ",[(:"):
+            return None
+
+        tag_name = _TAG_NAME_RE.search(selector.strip()).group(1)
+        return tag_name.lower() if tag_name else None
+
+
+class ExtractionSpec:
+    """
+    Extraction spec of one page type.
+
+    All the tags of the page are visited once.
+    The fields are indexed by their tag names,
+    so a tag is checked only by the fields, which can match it.
+    """
+
+    def __init__(self, fields: dict[str, Field]) -> None:
+        self.fields = fields
+
+        # Every field with its parent group field, None for the top level fields.
+        self._fields_by_tag_name: dict[
+            str | None, list[tuple[str, Field, Field | None]]
+        ] = {}
+        self._index_fields(fields, None)
+
+        # The fields, which can match any tag, are checked for every tag.
+        any_tag_fields = self._fields_by_tag_name.get(None, [])
+        for tag_name, tag_fields in self._fields_by_tag_name.items():
+            if tag_name is not None:
+                tag_fields.extend(any_tag_fields)
+
+    def extract(self, soup: BeautifulSoup) -> dict:
+        """
+        Matching the spec against the page.
+
+        Parameters:
+            soup: BeautifulSoup - the page soup
+
+        Returns:
+            dict - the field values by the field names
+        """
+        result = {name: field.empty() for name, field in self.fields.items()}
+
+        # The values of the matched group tags by their ids.
+        groups: dict[int, dict[int, dict]] = {}
+        any_tag_fields = self._fields_by_tag_name.get(None, [])
+
+        for tag in soup.descendants:
+            if not isinstance(tag, Tag):
+                continue
+
+            for name, field, parent in self._fields_by_tag_name.get(
+                tag.name, any_tag_fields
+            ):
+                if parent is None:
+                    owner = result
+                else:
+                    owner = self._get_owner_group(tag, groups.get(id(parent)))
+                    if owner is None:
+                        continue
+
+                if not field.many and owner[name] is not None:
+                    continue
+
+                if not field.pattern.match(tag):
+                    continue
+
+                value = field.get_value(tag)
+
+                if field.many:
+                    owner[name].append(value)
+                else:
+                    owner[name] = value
+
+                if field.fields:
+                    groups.setdefault(id(field), {})[id(tag)] = value
+
+        return result
+
+    def _index_fields(self, fields: dict[str, Field], parent: Field | None) -> None:
+        for name, field in fields.items():
+            self._fields_by_tag_name.setdefault(field.tag_name, []).append(
+                (name, field, parent)
+            )
+            self._index_fields(field.fields, field)
+
+    @staticmethod
+    def _get_owner_group(
+        tag: Tag, parent_groups: dict[int, dict] | None
+    ) -> dict | None:
+        """Getting the value of the closest matched group tag, which contains the tag."""
+        if not parent_groups:
+            return None
+
+        for ancestor in tag.parents:
+            group = parent_groups.get(id(ancestor))
+            if group is not None:
+                return group
+
+        return None
@@ -1,126 +1,123 @@
-import asyncio
-import logging
-
 from src.core import settings
 from src.crud import CrudWKRadical
 from src.database import SessionLocal
+from src.fetcher import Fetcher
 from src.models import WKRadical
-from src.parsers.base import BaseParser
-
-
-class WKRadicalsParser(BaseParser):
-    def __init__(self,  is_download_image: bool = False):
-        super().__init__()
-
-        # The class names of the spans which are highlighted in the mnemonics.
-        self.meaning_highlight_tag = "span"
-        self.meaning_highlight_class = "radical-highlight"
+from src.parsers.base import (
+    LEVEL_FIELD,
+    RADICAL_HIGHLIGHTS_FIELD,
+    BaseExtractor,
+    BaseParser,
+)
+from src.parsers.highlight import Highlighter
+from src.parsers.spec import ExtractionSpec, Field
 
-        # The class name of the "a" tag which has link to the radical page.
-        self.radicals_page_link_class = (
-            "subject-character subject-character--radical "
-            "subject-character--grid subject-character--unlocked"
-        )
 
-        self.crud_wk_radical = CrudWKRadical(WKRadical)
-        self.is_download_image = is_download_image
-
-    def run(self) -> None:
-        """
-        Run the parser.
-        """
-        tasks = []
-
-        for difficulty_level in self.difficulty_levels:
-            radical_list_page_url = (
-                f"{settings.WANIKANI_BASE_URL}/radicals?difficulty={difficulty_level}"
-            )
-            soup = self._get_page_soup(radical_list_page_url)
-            radical_page_urls = self._get_element_links(
-                soup, self.radicals_page_link_class
-            )
-            total_radical_count = len(radical_page_urls)
-
-            for i, radical_page_url in enumerate(radical_page_urls):
-                if not self._is_radical_exists(radical_page_url):
-                    tasks.append(
-                        asyncio.create_task(
-                            self._parse_radical_page(
-                                radical_page_url,
-                                i,
-                                total_radical_count
-                            )
-                        )
-                    )
-                else:
-                    logging.warning(
-                        f"{radical_page_url} already exists in the database."
-                    )
-
-    def _is_radical_exists(self, url: str) -> bool:
-        """Checking if radical exists in the database by its url."""
-        with SessionLocal() as db:
-            return self.crud_wk_radical.is_radical_by_url(db, url)
+class RadicalRecord:
+    """The radical data extracted from its page."""
 
-    async def _parse_radical_page(
+    def __init__(
         self,
-        radical_page_url: str,
-        i: int,
-        total_radical_count: int
-    ) -> WKRadical:
+        url: str,
+        level: int,
+        symbol: str,
+        meaning: str,
+        mnemonic: str,
+        symbol_image_url: str,
+    ) -> None:
+        self.url = url
+        self.level = level
+        self.symbol = symbol
+        self.meaning = meaning
+        self.mnemonic = mnemonic
+        self.symbol_image_url = symbol_image_url
+
+
+class WKRadicalExtractor(BaseExtractor):
+    spec = ExtractionSpec(
+        {
+            "level": LEVEL_FIELD,
+            "symbol": Field("span.page-header__icon--radical"),
+            # Symbol is stored as an image, if it's WaniKani custom radical.
+            "symbol_image_url": Field("wk-character-image.radical-image", attr="src"),
+            "meaning": Field("p.subject-section__meanings-items"),
+            "mnemonic": Field("p.subject-section__text"),
+            "highlighted_radicals": RADICAL_HIGHLIGHTS_FIELD,
+        }
+    )
+
+    def extract(self, page_url: str, page_html: str) -> RadicalRecord:
         """
         Parsing the radical info from page.
 
         Parameters:
-            radical_page_url: str - page of the radical to parse
+            page_url: str - page of the radical to parse
+            page_html: str - html of the page
 
         Returns:
-            WaniKaniRadical object
+            RadicalRecord object
         """
-        soup = await self._get_page_soup(radical_page_url)
+        fields = self._extract_fields(page_html)
 
-        if soup == None:
-            return None
-
-        level = await self._get_element_level(soup)
-        meaning = soup.find("p", class_="subject-section__meanings-items").text.strip()
-        mnemonic = soup.find("p", class_="subject-section__text").text.strip()
+        # Highlighting radical meaning in mnemonic with the upper case.
+        highlighter = Highlighter(fields["highlighted_radicals"])
+        mnemonic = highlighter.highlight(fields["mnemonic"].strip())
+
+        return RadicalRecord(
+            url=page_url,
+            level=int(fields["level"].strip()),
+            symbol=fields["symbol"].strip(),
+            meaning=fields["meaning"].strip(),
+            mnemonic=mnemonic,
+            symbol_image_url=fields["symbol_image_url"] or "",
+        )
 
-        symbol = soup.find(
-            "span", class_="page-header__icon page-header__icon--radical"
-        ).text.strip()
 
-        # Symbol is stored as an image, if it's WaniKani custom radical.
-        symbol_image_url = ""
-        symbol_image_element = soup.find("wk-character-image", class_="radical-image")
+class WKRadicalsParser(BaseParser):
+    extractor_class = WKRadicalExtractor
 
-        if symbol_image_element:
-            symbol_image_url = symbol_image_element.get("src")
+    def __init__(
+        self, is_download_image: bool = False, fetcher: Fetcher | None = None
+    ):
+        super().__init__("wk_radical", fetcher)
 
-            if self.is_download_image:
-                self._download_file(symbol_image_url, f"output/images/{meaning}.svg")
+        # The class name of the "a" tag which has link to the radical page.
+        self.page_link_class = (
+            "subject-character subject-character--radical "
+            "subject-character--grid subject-character--unlocked"
+        )
 
-        # Highlighting radical meaning in mnemonic with the upper case.
-        highlighted_radicals = self._get_highlighted_radicals(soup)
+        self.crud = CrudWKRadical(WKRadical)
+        self.is_download_image = is_download_image
 
-        for highlighted_radicals in highlighted_radicals:
-            mnemonic = self._highlight_text(mnemonic, highlighted_radicals)
+    def _get_list_page_url(self, difficulty_level: str) -> str:
+        return f"{settings.WANIKANI_BASE_URL}/radicals?difficulty={difficulty_level}"
 
-        with SessionLocal() as db:
-            wk_radical = WKRadical(
-                level=int(level),
-                symbol=symbol,
-                meaning=meaning,
-                mnemonic=mnemonic,
-                is_symbol_image=bool(symbol_image_url),
-                url=radical_page_url,
+    async def prepare_record(self, record: RadicalRecord) -> RadicalRecord:
+        """Downloading the radical image, if the radical is stored as an image."""
+        if record.symbol_image_url and self.is_download_image:
+            await self._download_file(
+                f"output/images/{record.meaning}.svg", record.symbol_image_url
             )
-            self.crud_wk_radical.create(db, wk_radical)
 
-        logging.info(f"Processed {radical_page_url} [{i}/{total_radical_count}]")
+        return record
+
+    def _create_object(self, record: RadicalRecord) -> WKRadical:
+        return WKRadical(
+            level=record.level,
+            symbol=record.symbol,
+            meaning=record.meaning,
+            mnemonic=record.mnemonic,
+            is_symbol_image=bool(record.symbol_image_url),
+            url=record.url,
+        )
 
+    def store_radical(self, record: RadicalRecord) -> int:
+        """
+        Inserting one radical into the database.
 
-if __name__ == "__main__":
-    # Parsing and saving all the radicals into the csv file.
-    wk_radicals_parser = WKRadicalsParser()
-    wk_radicals_parser.run()
+        Returns:
+            int - the radical id
+        """
+        with SessionLocal() as db:
+            return self.crud.create(db, self._create_objects([record])[0]).id
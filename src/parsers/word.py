@@ -1,16 +1,17 @@
-import asyncio
-import logging
-
 from src.core import settings
-from src.crud import (
-    CrudWord,
-    CrudWordContextSentence,
-    CrudWordMeaning,
-    CrudWordUsePattern,
-)
-from src.database import SessionLocal
+from src.crud import CrudWord
+from src.fetcher import Fetcher
 from src.models import Word, WordContextSentence, WordMeaning, WordUsePattern
-from src.parsers.base import BaseParser, Meaning, Mnemonic
+from src.parsers.base import (
+    LEVEL_FIELD,
+    MEANINGS_FIELD,
+    BaseExtractor,
+    BaseParser,
+    Meaning,
+    Mnemonic,
+    mnemonic_field,
+)
+from src.parsers.spec import ExtractionSpec, Field
 
 
 class AudioType:
@@ -45,279 +46,284 @@ class ContextSentence(Sentence):
         super().__init__(japanese, english)
 
 
-class WordParser(BaseParser):
-    def __init__(self, is_download_audio: bool = True) -> None:
-        super().__init__()
-
-        self.is_download_audio = is_download_audio
-
-        # The class name of the "a" tag which has link to the wrod page.
-        self.word_page_link_class = (
-            "subject-character subject-character--vocabulary "
-            "subject-character--grid subject-character--unlocked"
-        )
-
-        self.crud_word = CrudWord(Word)
-        self.crud_word_context_sentence = CrudWordContextSentence(WordContextSentence)
-        self.crud_word_use_pattern = CrudWordUsePattern(WordUsePattern)
-        self.crud_word_meaning = CrudWordMeaning(WordMeaning)
-
-    async def run(self) -> None:
-        """
-        Run the parser.
-        """
-        tasks = []
+class WordRecord:
+    """
+    The word data extracted from its page.
+    The reading audio file name is set after the audio is downloaded.
+    """
 
-        for difficulty_level in self.difficulty_levels:
-            word_list_page_url = (
-                f"{settings.WANIKANI_BASE_URL}/vocabulary?difficulty={difficulty_level}"
-            )
-            soup = await self._get_page_soup(word_list_page_url)
-            word_page_urls = self._get_element_links(soup, self.word_page_link_class)
-
-            total_word_count = len(word_page_urls)
-
-            for i, word_page_url in enumerate(word_page_urls):
-                if not self._is_word_exists(word_page_url):
-                    tasks.append(
-                        asyncio.create_task(
-                            self._parse_word_page(
-                                word_page_url, i + 1, total_word_count
-                            )
-                        )
+    def __init__(
+        self,
+        url: str,
+        level: int,
+        symbols: str,
+        meanings: list[Meaning],
+        meaning_explanation: Mnemonic,
+        types: str,
+        reading: str,
+        reading_explanation: Mnemonic,
+        reading_audio_urls: dict[str, str],
+        context_sentences: list[ContextSentence],
+        use_patterns: list[UsePattern],
+    ) -> None:
+        self.url = url
+        self.level = level
+        self.symbols = symbols
+        self.meanings = meanings
+        self.meaning_explanation = meaning_explanation
+        self.types = types
+        self.reading = reading
+        self.reading_explanation = reading_explanation
+        self.reading_audio_urls = reading_audio_urls
+        self.reading_audio_filename: str | None = None
+        self.context_sentences = context_sentences
+        self.use_patterns = use_patterns
+
+
+class WordExtractor(BaseExtractor):
+    spec = ExtractionSpec(
+        {
+            "level": LEVEL_FIELD,
+            "symbols": Field("span.page-header__icon--vocabulary"),
+            "meanings": MEANINGS_FIELD,
+            "meaning_explanation": mnemonic_field("subject-section--meaning"),
+            "reading": Field("div.reading-with-audio__reading"),
+            "reading_explanation": mnemonic_field("subject-section--reading"),
+            # There are two audio for the vocabulary word:
+            # one with female voice and one with male voice.
+            # Because I don't see the reason to parse both voices,
+            # I will parse only female voice.
+            "reading_audio": Field(
+                "audio.reading-with-audio__audio",
+                fields={"sources": Field("source", many=True, attr="src")},
+            ),
+            "context_sentences": Field(
+                "div.subject-section__text--grouped",
+                many=True,
+                fields={"sentences": Field("p", many=True)},
+            ),
+            "use_pattern_names": Field(
+                "a.subject-collocations__pattern-name", many=True
+            ),
+            "use_pattern_collocations": Field(
+                "li.subject-collocations__pattern-collocation",
+                many=True,
+                fields={
+                    "examples": Field(
+                        "div.context-sentences",
+                        many=True,
+                        fields={"sentences": Field("p", many=True)},
                     )
-                else:
-                    logging.warning(f"{word_page_url} already exists in the database.")
+                },
+            ),
+        }
+    )
 
-        await asyncio.gather(*tasks)
-
-    def _is_word_exists(self, url: str) -> bool:
-        """Checking if a word exists in the database by url."""
-        with SessionLocal() as db:
-            return self.crud_word.is_word_by_url(db, url)
-
-    async def _parse_word_page(
-        self, word_page_url: str, i: int, total_word_count: int
-    ) -> Word:
+    def extract(self, page_url: str, page_html: str) -> WordRecord:
         """
         Parsing the word info from the page.
 
         Parameters:
-            word_page_url: str - page of the word to parse
+            page_url: str - page of the word to parse
+            page_html: str - html of the page
 
         Returns:
-            Word object
+            WordRecord object
         """
-        soup = await self._get_page_soup(word_page_url)
-
-        if soup == None:
-            return None
-
-        logging.info(f"Processing {word_page_url} [{i}/{total_word_count}]")
-
-        level = self._get_element_level(soup)
-        symbols = soup.find(
-            "span", class_="page-header__icon page-header__icon--vocabulary"
-        ).text.strip()
-
-        meanings: list[Meaning] = self._get_element_meanings(soup)
-        meaning_explanation: Mnemonic = self._get_mnemonic(
-            soup, "subject-section--meaning"
-        )
-
-        types = self._get_word_types(soup)
-
-        reading = self._get_reading(soup)
-        reading_explanation: Mnemonic = self._get_mnemonic(
-            soup, "subject-section--reading"
+        fields = self._extract_fields(page_html)
+
+        return WordRecord(
+            url=page_url,
+            level=fields["level"].strip(),
+            symbols=fields["symbols"].strip(),
+            meanings=self._get_element_meanings(fields["meanings"]),
+            meaning_explanation=self._get_mnemonic(fields["meaning_explanation"]),
+            types=self._get_word_types(fields["meanings"]),
+            reading=fields["reading"].strip(),
+            reading_explanation=self._get_mnemonic(fields["reading_explanation"]),
+            reading_audio_urls=self._get_reading_audio_urls(fields["reading_audio"]),
+            context_sentences=self._get_context_sentences(
+                fields["context_sentences"]
+            ),
+            use_patterns=self._get_use_patterns(
+                fields["use_pattern_names"], fields["use_pattern_collocations"]
+            ),
         )
-        reading_audio_name = self._download_reading_audio(soup, symbols, AudioType.MPEG)
-
-        context_sentences: list[WordContextSentence] = self._get_context_sentences(soup)
-        use_patterns: list[WordUsePattern] = self._get_use_patterns(soup)
-
-        # Insert all data into the database.
-        with SessionLocal() as db:
-            # Insert word.
-            word = self.crud_word.create(
-                db,
-                Word(
-                    url=word_page_url,
-                    level=level,
-                    symbols=symbols,
-                    reading=reading,
-                    reading_explanation=reading_explanation.mnemonic,
-                    reading_audio_filename=reading_audio_name,
-                    types=types,
-                ),
-            )
-
-            # Insert context sentences.
-            for context_sentence in context_sentences:
-                context_sentence.word_id = word.id
-
-            self.crud_word_context_sentence.create_many(db, context_sentences)
-
-            # Insert meanings.
-            meaning_bulk = []
-            for meaning in meanings:
-                meaning_bulk.append(
-                    WordMeaning(
-                        word_id=word.id,
-                        meaning=meaning.meaning,
-                        is_primary=meaning.is_primary,
-                        explanation=meaning_explanation.mnemonic,
-                    )
-                )
-
-            self.crud_word_meaning.create_many(db, meaning_bulk)
-
-            # Insert use patterns.
-            for use_pattern in use_patterns:
-                use_pattern.word_id = word.id
-
-            self.crud_word_use_pattern.create_many(db, use_patterns)
-
-        logging.info(f"Processed {word_page_url} [{i}/{total_word_count}]")
 
-    def _get_word_types(self, soup):
+    def _get_word_types(self, meaning_blocks: list[dict]) -> str:
         """
-        Get word types from the soup.
+        Get word types from the meaning blocks.
         """
-        for div_meaning in soup.find_all("div", class_="subject-section__meanings"):
-            meaning_type = div_meaning.find(
-                "h2", class_="subject-section__meanings-title"
-            ).text
-            meaning_text = div_meaning.find(
-                "p", class_="subject-section__meanings-items"
-            ).text
-
-            if meaning_type.strip() == "Word Type":
-                return meaning_text
+        for meaning_block in meaning_blocks:
+            if meaning_block["title"].strip() == "Word Type":
+                return meaning_block["items"]
 
         return ""
 
-    def _get_reading(self, soup):
+    def _get_reading_audio_urls(self, audio_block: dict | None) -> dict[str, str]:
         """
-        Get word reading from the soup.
+        Get reading audio urls.
 
         Parameters:
-            soup: BeautifulSoup object
-        """
-        return soup.find("div", class_="reading-with-audio__reading").text.strip()
-
-    def _download_reading_audio(
-        self, soup, symbols: str, prefered_file_type: str
-    ) -> str | None:
-        """
-        Get reading audio.
-        There are two audio for the vocabulary word:
-        one with female voice and one with male voice.
-        Because I don't see the reason to parse both voices,
-        I will parse only female voice.
-
-        Parameters:
-            soup: BeautifulSoup object
+            audio_block: dict | None - the value of the reading audio field.
 
         Returns:
-            audio_file_name: str - name of the audio file.
+            dict[str, str] - audio urls by the audio type, empty if there is no audio.
         """
-        audio_block = soup.find("audio", class_="reading-with-audio__audio")
-
         if not audio_block:
-            return None
+            return {}
 
-        file_name = f"audio_{symbols}.{prefered_file_type}"
+        webm_audio_url, mpeg_audio_url = audio_block["sources"]
 
-        if self.is_download_audio:
-            webm_audio_element, mpeg_audio_element = audio_block.find_all("source")
-            downloading_audio_url = ""
-
-            match prefered_file_type:
-                case AudioType.WEBM:
-                    downloading_audio_url = webm_audio_element.get("src")
-                case AudioType.MPEG:
-                    downloading_audio_url = mpeg_audio_element.get("src")
-                case _:
-                    raise ValueError(
-                        f"There is no type {prefered_file_type} for audio."
-                    )
-
-            file_path = f"output/audio/{file_name}"
-            self._download_file(file_path, downloading_audio_url)
+        return {
+            AudioType.WEBM: webm_audio_url,
+            AudioType.MPEG: mpeg_audio_url,
+        }
 
-        return file_name
-
-    def _get_use_patterns(self, soup) -> list[WordUsePattern]:
+    def _get_use_patterns(
+        self, use_pattern_names: list[str], collocations: list[dict]
+    ) -> list[UsePattern]:
         """
         Get a list of the use patterns for the word.
 
         Parameters:
-            soup: BeautifulSoup object.
+            use_pattern_names: list[str] - the names of the use patterns.
+            collocations: list[dict] - the examples of every use pattern.
 
         Returns:
-            use_patterns: list[WordUsePattern] - list of use patterns.
+            use_patterns: list[UsePattern] - list of use patterns.
         """
-        use_patterns: list[WordUsePattern] = []
-
-        use_pattern_list = (
-            soup.find_all("a", class_="subject-collocations__pattern-name") or []
-        )
-        example_lists = (
-            soup.find_all("li", class_="subject-collocations__pattern-collocation")
-            or []
-        )
+        use_patterns: list[UsePattern] = []
 
-        for use_pattern, example_list in zip(use_pattern_list, example_lists):
-            for example_block in example_list.find_all(
-                "div", class_="context-sentences"
-            ):
-                japanese_sentence, english_sentence = example_block.find_all("p")
-                japanese_sentence, english_sentence = (
-                    japanese_sentence.text.strip(),
-                    english_sentence.text.strip(),
-                )
+        for use_pattern, collocation in zip(use_pattern_names, collocations):
+            for example in collocation["examples"]:
+                japanese_sentence, english_sentence = example["sentences"]
 
                 use_patterns.append(
-                    WordUsePattern(
-                        pattern=use_pattern.text.strip(),
-                        japanese=japanese_sentence,
-                        english=english_sentence,
+                    UsePattern(
+                        pattern=use_pattern.strip(),
+                        example=UsePatternExample(
+                            japanese=japanese_sentence.strip(),
+                            english=english_sentence.strip(),
+                        ),
                     )
                 )
 
         return use_patterns
 
-    def _get_context_sentences(self, soup) -> list[ContextSentence]:
+    def _get_context_sentences(
+        self, sentence_blocks: list[dict]
+    ) -> list[ContextSentence]:
         """
         Get a list of contextual sentences for the word.
 
         Args:
-            soup: BeautifulSoup object
+            sentence_blocks: list[dict] - the values of the context sentences field.
 
         Returns:
             context_sentences: list[ContextSentence] - list of contextual sentences.
         """
         context_sentences = []
 
-        for sentence_block in soup.find_all(
-            "div", class_="subject-section__text subject-section__text--grouped"
-        ):
-            japanese_sentence, english_sentence = sentence_block.find_all("p")
-            japanese_sentence, english_sentence = (
-                japanese_sentence.text.strip(),
-                english_sentence.text.strip(),
-            )
+        for sentence_block in sentence_blocks:
+            japanese_sentence, english_sentence = sentence_block["sentences"]
 
             context_sentences.append(
-                WordContextSentence(
-                    japanese=japanese_sentence, english=english_sentence
+                ContextSentence(
+                    japanese=japanese_sentence.strip(),
+                    english=english_sentence.strip(),
                 )
             )
 
         return context_sentences
 
 
-if __name__ == "__main__":
-    word_parser = WordParser()
-    word_parser.run()
+class WordParser(BaseParser):
+    extractor_class = WordExtractor
+
+    def __init__(
+        self, is_download_audio: bool = True, fetcher: Fetcher | None = None
+    ) -> None:
+        super().__init__("word", fetcher)
+
+        self.is_download_audio = is_download_audio
+        self.prefered_audio_type = AudioType.MPEG
+
+        # The class name of the "a" tag which has link to the wrod page.
+        self.page_link_class = (
+            "subject-character subject-character--vocabulary "
+            "subject-character--grid subject-character--unlocked"
+        )
+
+        self.crud = CrudWord(Word)
+
+    def _get_list_page_url(self, difficulty_level: str) -> str:
+        return f"{settings.WANIKANI_BASE_URL}/vocabulary?difficulty={difficulty_level}"
+
+    async def prepare_record(self, record: WordRecord) -> WordRecord:
+        """Downloading the reading audio."""
+        record.reading_audio_filename = await self._download_reading_audio(
+            record, self.prefered_audio_type
+        )
+        return record
+
+    def _create_object(self, record: WordRecord) -> Word:
+        return Word(
+            url=record.url,
+            level=record.level,
+            symbols=record.symbols,
+            reading=record.reading,
+            reading_explanation=record.reading_explanation.mnemonic,
+            reading_audio_filename=record.reading_audio_filename,
+            types=record.types,
+            context_sentences=[
+                WordContextSentence(
+                    japanese=context_sentence.japanese,
+                    english=context_sentence.english,
+                )
+                for context_sentence in record.context_sentences
+            ],
+            meanings=[
+                WordMeaning(
+                    meaning=meaning.meaning,
+                    is_primary=meaning.is_primary,
+                    explanation=record.meaning_explanation.mnemonic,
+                )
+                for meaning in record.meanings
+            ],
+            use_patterns=[
+                WordUsePattern(
+                    pattern=use_pattern.pattern,
+                    japanese=use_pattern.example.japanese,
+                    english=use_pattern.example.english,
+                )
+                for use_pattern in record.use_patterns
+            ],
+        )
+
+    async def _download_reading_audio(
+        self, record: WordRecord, prefered_file_type: str
+    ) -> str | None:
+        """
+        Download reading audio.
+
+        Parameters:
+            record: WordRecord - the extracted word
+
+        Returns:
+            audio_file_name: str - name of the audio file.
+        """
+        if not record.reading_audio_urls:
+            return None
+
+        file_name = f"audio_{record.symbols}.{prefered_file_type}"
+
+        if self.is_download_audio:
+            if prefered_file_type not in record.reading_audio_urls:
+                raise ValueError(f"There is no type {prefered_file_type} for audio.")
+
+            downloading_audio_url = record.reading_audio_urls[prefered_file_type]
+            file_path = f"output/audio/{file_name}"
+            await self._download_file(file_path, downloading_audio_url)
+
+        return file_name
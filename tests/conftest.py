@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import event
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The tests use the in memory SQLite database, it's set before the settings are loaded.
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["DATABASE_ASYNC"] = "false"
+
+import src.models  # noqa: E402
+from src.database import Base, SessionLocal, engine  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """The session of the empty database, the tables are dropped after the test."""
+    Base.metadata.create_all(engine)
+
+    with SessionLocal() as session:
+        yield session
+
+    Base.metadata.drop_all(engine)
+
+
+class StatementRecorder:
+    """Recording the statements, which are executed by the engine."""
+
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, object]] = []
+
+    def __enter__(self) -> "StatementRecorder":
+        event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(engine, "before_cursor_execute", self._record)
+
+    @property
+    def selects(self) -> list[tuple[str, object]]:
+        return [
+            (statement, parameters)
+            for statement, parameters in self.statements
+            if statement.lstrip().upper().startswith("SELECT")
+        ]
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+
+@pytest.fixture
+def record_statements():
+    return StatementRecorder
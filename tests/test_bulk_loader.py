@@ -0,0 +1,175 @@
+import datetime
+import os
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.crud import BulkLoader
+from src.crud.bulk_loader import CopyRowsReader
+from src.database import Base
+from src.models import Kanji, KanjiMeaning, KanjiReading
+
+
+def test_children_are_inserted_in_one_batch(db, record_statements):
+    kanji = [
+        Kanji(
+            level=1,
+            symbol=f"kanji {number}",
+            url=f"kanji/{number}",
+            readings=[
+                KanjiReading(reading="いち", type="On’yomi", is_primary=True),
+                KanjiReading(reading="ひと", type="Kun’yomi", is_primary=False),
+            ],
+            meanings=[KanjiMeaning(meaning=f"One {number}", is_primary=True)],
+        )
+        for number in range(5)
+    ]
+
+    with record_statements() as recorder:
+        BulkLoader(Kanji).load(db, kanji)
+
+    inserted_tables = [
+        statement.split()[2]
+        for statement, _ in recorder.statements
+        if statement.lstrip().upper().startswith("INSERT")
+    ]
+    assert inserted_tables.count("kanji_readings") == 1
+    assert inserted_tables.count("kanji_meanings") == 1
+
+    meanings = db.execute(
+        select(Kanji.url, KanjiMeaning.meaning).join(Kanji.meanings).order_by(Kanji.url)
+    ).all()
+    assert meanings == [(f"kanji/{number}", f"One {number}") for number in range(5)]
+    assert db.query(KanjiReading).count() == 10
+
+
+@pytest.mark.parametrize(
+    "value, formatted",
+    [
+        (None, "\\N"),
+        (True, "t"),
+        (False, "f"),
+        (3, "3"),
+        (datetime.datetime(2026, 1, 2, 3, 4, 5), "2026-01-02T03:04:05"),
+        (
+            "tab\tnew line\ncarriage\rback\\slash",
+            "tab\\tnew line\\ncarriage\\rback\\\\slash",
+        ),
+    ],
+)
+def test_format_copy_value(value, formatted):
+    assert BulkLoader._format_copy_value(value) == formatted
+
+
+def test_copy_rows_reader_reads_lines_on_demand():
+    read_lines = []
+
+    def iter_lines():
+        for number in range(100):
+            read_lines.append(number)
+            yield f"{number:04}\n"
+
+    reader = CopyRowsReader(iter_lines())
+
+    assert reader.read(8) == "0000\n000"
+    assert len(read_lines) == 2
+    assert reader.read(4) == "1\n00"
+    rest = "".join(f"{number:04}\n" for number in range(3, 100))
+    assert reader.read() == "02\n" + rest
+    assert reader.read(8) == ""
+
+
+class CopySession:
+    """Session, which records the executed statements instead of running them."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def execute(self, statement) -> None:
+        self.statements.append(" ".join(str(statement).split()))
+
+
+class CopyCursor:
+    """Cursor, which reads the copied data like psycopg2 does."""
+
+    def __init__(self) -> None:
+        self.copies: list[tuple[str, str]] = []
+
+    def copy_expert(self, sql: str, file) -> None:
+        chunks = iter(lambda: file.read(8192), "")
+        self.copies.append((sql, "".join(chunks)))
+
+
+def test_copy_statements():
+    kanji = Kanji(
+        level=1,
+        symbol="一",
+        url="kanji/one",
+        meanings=[KanjiMeaning(meaning="One\tThing", is_primary=True)],
+    )
+    db = CopySession()
+    cursor = CopyCursor()
+
+    BulkLoader(Kanji)._copy(db, cursor, [kanji])
+
+    assert db.statements[:2] == [
+        "CREATE TEMPORARY TABLE staging_kanji ON COMMIT DROP AS "
+        "SELECT level, symbol, url, content_hash, created_at FROM kanji WITH NO DATA",
+        "INSERT INTO kanji (level, symbol, url, content_hash, created_at) "
+        "SELECT level, symbol, url, content_hash, created_at FROM staging_kanji",
+    ]
+    assert db.statements[-1].startswith("INSERT INTO kanji_meanings (")
+    assert db.statements[-1].endswith(
+        "FROM staging_kanji_meanings staging JOIN kanji parent "
+        "ON parent.url = staging.parent_url"
+    )
+
+    (kanji_sql, kanji_data), (meaning_sql, meaning_data) = cursor.copies
+    assert kanji_sql == (
+        "COPY staging_kanji (level, symbol, url, content_hash, created_at) FROM STDIN"
+    )
+    assert kanji_data.startswith("1\t一\tkanji/one\t\\N\t")
+    assert meaning_sql.endswith(", parent_url) FROM STDIN")
+    assert "One\\tThing\tt\t" in meaning_data
+    assert meaning_data.endswith("\tkanji/one\n")
+
+
+@pytest.mark.skipif(
+    not os.environ.get("TEST_POSTGRESQL_URL"),
+    reason="TEST_POSTGRESQL_URL of the test PostgreSQL database is not set",
+)
+def test_copy_into_postgresql():
+    pytest.importorskip("psycopg2")
+    engine = create_engine(os.environ["TEST_POSTGRESQL_URL"])
+    Base.metadata.create_all(engine)
+
+    try:
+        with Session(engine) as db:
+            BulkLoader(Kanji).load(
+                db,
+                [
+                    Kanji(
+                        level=1,
+                        symbol=f"kanji {number}",
+                        url=f"kanji/{number}",
+                        meanings=[
+                            KanjiMeaning(meaning=f"One\t{number}\\", is_primary=True)
+                        ],
+                    )
+                    for number in range(3)
+                ],
+            )
+
+            meanings = db.execute(
+                select(Kanji.url, KanjiMeaning.meaning, KanjiMeaning.created_at)
+                .join(Kanji.meanings)
+                .order_by(Kanji.url)
+            ).all()
+    finally:
+        Base.metadata.drop_all(engine)
+
+    assert [(url, meaning) for url, meaning, _ in meanings] == [
+        (f"kanji/{number}", f"One\t{number}\\") for number in range(3)
+    ]
+    assert all(created_at is not None for _, _, created_at in meanings)
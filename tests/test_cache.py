@@ -0,0 +1,87 @@
+import itertools
+
+import pytest
+
+from src.fetcher import cache
+from src.fetcher.cache import ResponseCache
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    """Every call of time.time is one second later, so the entries are ordered."""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(cache.time, "time", lambda: float(next(ticks)))
+
+
+def make_cache(tmp_path, ttl: float = 10, max_size: int = 1000) -> ResponseCache:
+    return ResponseCache(cache_dir=str(tmp_path), ttl=ttl, max_size=max_size)
+
+
+def get_body_files(tmp_path) -> list:
+    return list((tmp_path / "bodies").iterdir())
+
+
+def test_entry_is_fresh_during_ttl(tmp_path):
+    response_cache = make_cache(tmp_path, ttl=5)
+    response_cache.store("kanji/one", "一", etag='"v1"', last_modified=None)
+
+    entry, body = response_cache.get("kanji/one")
+
+    assert body == "一"
+    assert entry.is_fresh(response_cache.ttl)
+    assert entry.get_conditional_headers() == {"If-None-Match": '"v1"'}
+
+    entry.stored_at -= 10
+    assert not entry.is_fresh(response_cache.ttl)
+
+
+def test_touch_makes_entry_fresh_again(tmp_path):
+    response_cache = make_cache(tmp_path, ttl=5)
+    response_cache.store("kanji/one", "一", etag='"v1"', last_modified=None)
+    entry, _ = response_cache.get("kanji/one")
+    entry.stored_at -= 10
+
+    response_cache.touch("kanji/one")
+
+    # The new stored time is written to the index on disk.
+    entry, body = make_cache(tmp_path, ttl=5).get("kanji/one")
+    assert body == "一"
+    assert entry.is_fresh(5)
+
+
+def test_shared_body_is_stored_once(tmp_path):
+    response_cache = make_cache(tmp_path)
+    response_cache.store("kanji/one", "same", etag=None, last_modified=None)
+    response_cache.store("kanji/two", "same", etag=None, last_modified=None)
+
+    assert len(get_body_files(tmp_path)) == 1
+
+    # The body is still referenced by the other url.
+    response_cache.store("kanji/one", "changed", etag=None, last_modified=None)
+    assert response_cache.get("kanji/two")[1] == "same"
+    assert len(get_body_files(tmp_path)) == 2
+
+    # The last reference is gone, so the body file is removed.
+    response_cache.store("kanji/two", "changed", etag=None, last_modified=None)
+    assert [path.read_text() for path in get_body_files(tmp_path)] == ["changed"]
+
+
+def test_oldest_entries_are_evicted(tmp_path):
+    response_cache = make_cache(tmp_path, max_size=25)
+
+    for number in range(3):
+        response_cache.store(f"kanji/{number}", f"{number}" * 10, None, None)
+
+    assert response_cache.get("kanji/0") is None
+    assert response_cache.get("kanji/1")[1] == "1" * 10
+    assert response_cache.get("kanji/2")[1] == "2" * 10
+    assert len(get_body_files(tmp_path)) == 2
+
+
+def test_body_bigger_than_max_size_is_kept(tmp_path):
+    response_cache = make_cache(tmp_path, max_size=5)
+    response_cache.store("kanji/small", "small", None, None)
+    response_cache.store("kanji/big", "b" * 10, None, None)
+
+    assert response_cache.get("kanji/small") is None
+    assert response_cache.get("kanji/big")[1] == "b" * 10
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from src.fetcher.retry import CircuitBreaker
+
+
+async def probe_after_failed_probe(exception: type[BaseException]) -> bool:
+    """Checking that the next request is let through after the probe raises exception."""
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    circuit_breaker.record_failure()
+
+    async def probe_request() -> None:
+        await circuit_breaker.wait()
+        try:
+            raise exception()
+        finally:
+            circuit_breaker.release_probe()
+
+    with pytest.raises(exception):
+        await asyncio.create_task(probe_request())
+
+    try:
+        await asyncio.wait_for(circuit_breaker.wait(), timeout=0.5)
+    except asyncio.TimeoutError:
+        return False
+
+    return True
+
+
+@pytest.mark.parametrize("exception", [ValueError, asyncio.CancelledError])
+def test_probe_is_released_on_error(exception):
+    assert asyncio.run(probe_after_failed_probe(exception))
+
+
+def test_probe_is_released_only_by_its_task():
+    async def run() -> bool:
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        circuit_breaker.record_failure()
+
+        await asyncio.create_task(circuit_breaker.wait())
+        # The other request ends while the probe is still in flight.
+        circuit_breaker.release_probe()
+
+        try:
+            await asyncio.wait_for(circuit_breaker.wait(), timeout=0.1)
+        except asyncio.TimeoutError:
+            return True
+
+        return False
+
+    assert asyncio.run(run())
@@ -0,0 +1,49 @@
+import asyncio
+
+from src.parsers import pipeline
+from src.parsers.wk_radical import WKRadicalsParser
+
+
+class ListPagesFetcher:
+    """Fetcher, which answers with the list pages of the published radical links."""
+
+    def __init__(self, link_class: str) -> None:
+        self.link_class = link_class
+        self.published_urls: list[str] = []
+        self.loaded_urls: list[str] = []
+
+    async def get_text(self, url: str, revalidate: bool = False) -> str:
+        self.loaded_urls.append(url)
+        links = "".join(
+            f'<a class="{self.link_class}" href="{page_url}"></a>'
+            for page_url in self.published_urls
+            if url.endswith("=pleasant")
+        )
+        return f"<html><body>{links}</body></html>"
+
+
+def test_every_pass_finds_the_new_elements(db, monkeypatch):
+    scheduled_urls = []
+
+    async def run_pipeline(self, page_urls: list[str]) -> None:
+        scheduled_urls.append(sorted(page_urls))
+
+    monkeypatch.setattr(pipeline.Pipeline, "run", run_pipeline)
+
+    parser = WKRadicalsParser()
+    fetcher = ListPagesFetcher(parser.page_link_class)
+    parser.fetcher = fetcher
+
+    fetcher.published_urls = ["radicals/ground"]
+    asyncio.run(parser.run())
+
+    fetcher.loaded_urls.clear()
+    fetcher.published_urls.append("radicals/fins")
+    asyncio.run(WKRadicalsParser(fetcher=fetcher).run())
+
+    # All the list pages are loaded again, the unfinished elements are resumed.
+    assert len(fetcher.loaded_urls) == len(parser.difficulty_levels)
+    assert scheduled_urls == [
+        ["radicals/ground"],
+        ["radicals/fins", "radicals/ground"],
+    ]
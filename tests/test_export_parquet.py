@@ -0,0 +1,71 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.anki_deck.export_to_parquet import ExportFormat, export_table
+from src.core import settings
+from src.database import Base
+from src.models import Kanji, KanjiReading
+
+READING_TYPES = ["On’yomi", "Kun’yomi", "On’yomi", "Nanori", None]
+
+
+@pytest.fixture
+def readings(db, monkeypatch):
+    """Kanji readings, which are exported by batches of two rows."""
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+
+    db.add(
+        Kanji(
+            level=1,
+            symbol="一",
+            url="kanji/one",
+            readings=[
+                KanjiReading(reading=f"reading {number}", type=reading_type)
+                for number, reading_type in enumerate(READING_TYPES)
+            ],
+        )
+    )
+    db.commit()
+
+
+def test_arrow_file_is_memory_mapped_without_copying(readings, tmp_path):
+    file_path = str(tmp_path / "kanji.arrow")
+    export_table(Base.metadata.tables["kanji"], file_path, ExportFormat.ARROW)
+
+    allocated_bytes = pa.total_allocated_bytes()
+    table = pa.ipc.open_file(pa.memory_map(file_path)).read_all()
+
+    # The uncompressed buffers are used right from the mapped file.
+    assert pa.total_allocated_bytes() == allocated_bytes
+    assert table.column("symbol").to_pylist() == ["一"]
+
+
+def test_arrow_low_cardinality_columns_are_dictionary_encoded(readings, tmp_path):
+    file_path = str(tmp_path / "kanji_readings.arrow")
+    rows_count = export_table(
+        Base.metadata.tables["kanji_readings"], file_path, ExportFormat.ARROW
+    )
+
+    reader = pa.ipc.open_file(pa.memory_map(file_path))
+    table = reader.read_all()
+
+    assert rows_count == len(READING_TYPES)
+    assert reader.num_record_batches == 3
+    assert pa.types.is_dictionary(table.schema.field("type").type)
+    assert not pa.types.is_dictionary(table.schema.field("reading").type)
+    assert table.column("type").to_pylist() == READING_TYPES
+
+
+def test_parquet_file(readings, tmp_path):
+    file_path = str(tmp_path / "kanji_readings.parquet")
+    export_table(
+        Base.metadata.tables["kanji_readings"], file_path, ExportFormat.PARQUET
+    )
+
+    table = pq.read_table(file_path)
+
+    assert table.column("type").to_pylist() == READING_TYPES
+    assert pq.ParquetFile(file_path).metadata.row_group(0).column(0).compression == (
+        settings.export_compression.upper()
+    )
@@ -0,0 +1,77 @@
+import pytest
+
+from src.anki_deck.export_to_csv import get_kanji_csv_rows, get_words_csv_rows
+from src.models import (
+    Kanji,
+    KanjiMeaning,
+    KanjiRadical,
+    KanjiReading,
+    WKRadical,
+    Word,
+    WordContextSentence,
+    WordMeaning,
+    WordUsePattern,
+)
+
+LEVELS = 10
+
+
+@pytest.fixture
+def elements(db):
+    """Two kanji and two words with all their children on every level."""
+    radical = WKRadical(level=1, symbol="一", meaning="Ground", url="radicals/ground")
+    db.add(radical)
+    db.flush()
+
+    for level in range(1, LEVELS + 1):
+        for number in range(2):
+            db.add(
+                Kanji(
+                    level=level,
+                    symbol=f"kanji {level}-{number}",
+                    url=f"kanji/{level}-{number}",
+                    radicals=[KanjiRadical(wk_radical_id=radical.id)],
+                    readings=[
+                        KanjiReading(reading="いち", type="On’yomi", is_primary=True),
+                        KanjiReading(reading="ひと", type="Kun’yomi", is_primary=False),
+                    ],
+                    meanings=[
+                        KanjiMeaning(meaning="One", is_primary=True),
+                        KanjiMeaning(meaning="Single", is_primary=False),
+                    ],
+                )
+            )
+            db.add(
+                Word(
+                    level=level,
+                    symbols=f"word {level}-{number}",
+                    url=f"vocabulary/{level}-{number}",
+                    meanings=[
+                        WordMeaning(meaning="One", is_primary=True, explanation="")
+                    ],
+                    context_sentences=[
+                        WordContextSentence(japanese="一つ", english="One thing")
+                    ],
+                    use_patterns=[
+                        WordUsePattern(pattern="一〜", japanese="一つ", english="One")
+                    ],
+                )
+            )
+
+    db.commit()
+
+
+@pytest.mark.parametrize("get_csv_rows", [get_kanji_csv_rows, get_words_csv_rows])
+def test_export_query_count_does_not_depend_on_level(
+    elements, record_statements, get_csv_rows
+):
+    with record_statements() as few_levels:
+        few_rows = get_csv_rows(before_level=1)
+
+    with record_statements() as all_levels:
+        all_rows = get_csv_rows(before_level=LEVELS)
+
+    assert len(few_rows) == 2
+    assert len(all_rows) == 2 * LEVELS
+    # One query for the elements and one for every children collection.
+    assert len(few_levels.selects) == len(all_levels.selects) == 4
@@ -0,0 +1,80 @@
+import json
+import os
+
+import pytest
+
+from src.core import settings
+from src.parsers.html_backend import get_html_backend
+from src.parsers.kanji import KanjiExtractor
+from src.parsers.wk_radical import WKRadicalExtractor
+from src.parsers.word import WordExtractor
+
+# The pages are synthetic, they follow the extractor selectors and not the real markup,
+# so the tests compare the backends and the strainer with each other only.
+PAGES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "pages")
+
+
+def read_page(page_name: str) -> str:
+    with open(os.path.join(PAGES_DIR, f"{page_name}.html"), encoding="utf-8") as file:
+        return file.read()
+
+
+@pytest.fixture(params=["lxml", "html.parser"])
+def backend(request, monkeypatch):
+    monkeypatch.setattr(settings, "html_parser_backend", request.param)
+    get_html_backend.cache_clear()
+    yield request.param
+    get_html_backend.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "page_name, extractor_class",
+    [
+        ("radical", WKRadicalExtractor),
+        ("kanji", KanjiExtractor),
+        ("vocabulary", WordExtractor),
+    ],
+)
+def test_sections_only_extracts_the_same_record(
+    backend, monkeypatch, page_name, extractor_class
+):
+    page_html = read_page(page_name)
+    records = []
+
+    for sections_only in (False, True):
+        monkeypatch.setattr(settings, "html_parse_sections_only", sections_only)
+        record = extractor_class().extract(page_name, page_html)
+        records.append(json.dumps(record, default=vars, ensure_ascii=False))
+
+    assert records[0] == records[1]
+
+
+def test_radical_page(backend):
+    record = WKRadicalExtractor().extract("radicals/ground", read_page("radical"))
+
+    assert record.level == 1
+    assert record.symbol == "一"
+    assert record.meaning == "Ground"
+    assert "the GROUND again" in record.mnemonic
+
+
+def test_kanji_page(backend):
+    record = KanjiExtractor().extract("kanji/一", read_page("kanji"))
+
+    assert record.symbol == "一"
+    assert record.radical_urls == ["https://www.wanikani.com/radicals/ground"]
+    assert [(reading.reading, reading.is_primary) for reading in record.readings] == [
+        ("いち", True),
+        ("いつ", True),
+        ("ひと", False),
+    ]
+
+
+def test_vocabulary_page(backend):
+    record = WordExtractor().extract("vocabulary/一つ", read_page("vocabulary"))
+
+    assert record.symbols == "一つ"
+    assert record.reading == "ひとつ"
+    assert record.reading_audio_urls["mpeg"].endswith("hitotsu-kyoko.mp3")
+    assert len(record.context_sentences) == 3
+    assert len(record.use_patterns) == 9
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from src.fetcher.media import parse_content_range
+from src.fetcher.session import Fetcher
+
+CONTENT = b"0123456789"
+
+
+@pytest.mark.parametrize(
+    "value, start_and_total",
+    [
+        ("bytes */10", (None, 10)),
+        ("bytes 5-9/10", (5, 10)),
+        ("bytes 0-4/*", (0, None)),
+        ("items 0-4/10", (None, None)),
+        ("", (None, None)),
+        (None, (None, None)),
+    ],
+)
+def test_parse_content_range(value, start_and_total):
+    assert parse_content_range(value) == start_and_total
+
+
+def respond_with_range(request: web.Request) -> web.Response:
+    """Answering like a server, which supports the Range requests."""
+    byte_range = request.headers.get("Range")
+
+    if byte_range is None:
+        return web.Response(body=CONTENT)
+
+    start = int(byte_range[len("bytes=") : -1])
+
+    if start >= len(CONTENT):
+        return web.Response(
+            status=416, headers={"Content-Range": f"bytes */{len(CONTENT)}"}
+        )
+
+    return web.Response(
+        status=206,
+        body=CONTENT[start:],
+        headers={"Content-Range": f"bytes {start}-{len(CONTENT) - 1}/{len(CONTENT)}"},
+    )
+
+
+def respond_from_start(request: web.Request) -> web.Response:
+    """Answering with the first bytes to every Range request."""
+    if request.headers.get("Range") is None:
+        return web.Response(body=CONTENT)
+
+    return web.Response(
+        status=206,
+        body=CONTENT,
+        headers={"Content-Range": f"bytes 0-{len(CONTENT) - 1}/{len(CONTENT)}"},
+    )
+
+
+def respond_without_range(request: web.Request) -> web.Response:
+    """Answering with the whole file like a server, which ignores the Range header."""
+    return web.Response(body=CONTENT)
+
+
+async def download(tmp_path, partial_content: bytes, respond) -> tuple[bytes, list]:
+    """Downloading the file, which is partially saved, from the local server."""
+    requests = []
+
+    async def handler(request: web.Request) -> web.Response:
+        requests.append(request.headers.get("Range"))
+        return respond(request)
+
+    app = web.Application()
+    app.router.add_get("/audio.mp3", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    file_path = tmp_path / "audio.mp3"
+    (tmp_path / "audio.mp3.part").write_bytes(partial_content)
+
+    async with Fetcher() as fetcher:
+        assert await fetcher.media_downloader.download(
+            f"http://127.0.0.1:{port}/audio.mp3", str(file_path)
+        )
+
+    await runner.cleanup()
+
+    assert not (tmp_path / "audio.mp3.part").exists()
+    return file_path.read_bytes(), requests
+
+
+def test_partial_file_is_resumed(tmp_path):
+    content, requests = asyncio.run(download(tmp_path, b"01234", respond_with_range))
+
+    assert content == CONTENT
+    assert requests == ["bytes=5-"]
+
+
+def test_complete_partial_file_is_finalized(tmp_path):
+    content, requests = asyncio.run(download(tmp_path, CONTENT, respond_with_range))
+
+    assert content == CONTENT
+    assert requests == [f"bytes={len(CONTENT)}-"]
+
+
+def test_other_range_is_downloaded_again(tmp_path):
+    content, requests = asyncio.run(download(tmp_path, b"01234", respond_from_start))
+
+    assert content == CONTENT
+    assert requests == ["bytes=5-", None]
+
+
+def test_ignored_range_overwrites_partial_file(tmp_path):
+    content, requests = asyncio.run(
+        download(tmp_path, b"01234", respond_without_range)
+    )
+
+    assert content == CONTENT
+    assert requests == ["bytes=5-"]
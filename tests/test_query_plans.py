@@ -0,0 +1,64 @@
+import pytest
+
+from src.crud import (
+    CrudKanji,
+    CrudKanjiMeaning,
+    CrudKanjiReading,
+    CrudWKRadical,
+    CrudWord,
+)
+from src.models import Kanji, KanjiMeaning, KanjiReading, WKRadical, Word
+
+# The lookups with the names of the indexes, which they must use.
+LOOKUPS = {
+    "radical by meaning": (
+        lambda db, kanji: CrudWKRadical(WKRadical).get_by_meaning(db, "Ground"),
+        "ix_wk_radicals_meaning",
+    ),
+    "radical by url": (
+        lambda db, kanji: CrudWKRadical(WKRadical).get_by_url(db, "radicals/ground"),
+        "ix_wk_radicals_url",
+    ),
+    "kanji by level": (
+        lambda db, kanji: CrudKanji(Kanji).get_by_level(db, 10),
+        "ix_kanji_level",
+    ),
+    "words by level": (
+        lambda db, kanji: CrudWord(Word).get_words_before_level(db, 10),
+        "ix_words_level",
+    ),
+    "kanji primary readings": (
+        lambda db, kanji: CrudKanjiReading(KanjiReading).get_primary_readings(
+            db, kanji
+        ),
+        "ix_kanji_readings_kanji_id",
+    ),
+    "kanji primary meaning": (
+        lambda db, kanji: CrudKanjiMeaning(KanjiMeaning).get_primary_meaning(
+            db, kanji
+        ),
+        "ix_kanji_meanings_kanji_id",
+    ),
+}
+
+
+@pytest.mark.parametrize("lookup, index_name", LOOKUPS.values(), ids=LOOKUPS.keys())
+def test_lookup_uses_index(db, record_statements, lookup, index_name):
+    kanji = Kanji(level=1, symbol="一", url="kanji/one")
+    db.add(kanji)
+    db.commit()
+    db.refresh(kanji)
+
+    with record_statements() as recorder:
+        lookup(db, kanji)
+
+    ((statement, parameters),) = recorder.selects
+    plan = [
+        row.detail
+        for row in db.connection().exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+    ]
+
+    assert not any(detail.startswith("SCAN") for detail in plan), plan
+    assert any(f"INDEX {index_name} " in detail for detail in plan), plan
@@ -0,0 +1,34 @@
+from src.crud import CrudWord
+from src.models import Word, WordMeaning
+
+
+def make_word(reading_audio_filename: str | None, content_hash: str) -> Word:
+    return Word(
+        level=1,
+        symbols="一つ",
+        url="vocabulary/一つ",
+        reading="ひとつ",
+        reading_audio_filename=reading_audio_filename,
+        content_hash=content_hash,
+        meanings=[WordMeaning(meaning="One Thing", is_primary=True, explanation="")],
+    )
+
+
+def test_upsert_writes_the_nulled_columns(db):
+    crud = CrudWord(Word)
+
+    assert crud.upsert_many_with_children(db, [make_word("hitotsu.mp3", "first")])
+    (word_id, created_at) = db.query(Word.id, Word.created_at).one()
+
+    # The unchanged object is skipped.
+    assert crud.upsert_many_with_children(db, [make_word("hitotsu.mp3", "first")]) == []
+
+    assert crud.upsert_many_with_children(db, [make_word(None, "second")])
+    db.expire_all()
+    word = db.query(Word).one()
+
+    assert word.id == word_id
+    assert word.created_at == created_at
+    assert word.reading_audio_filename is None
+    assert word.content_hash == "second"
+    assert [meaning.meaning for meaning in word.meanings] == ["One Thing"]